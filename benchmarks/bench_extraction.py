@@ -0,0 +1,126 @@
+# bench_extraction.py - micro-benchmark de extract_hospital_name / extract_modelo_heuristic
+# Uso: python benchmarks/bench_extraction.py [--articles 200] [--paragraphs 60]
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import (  # noqa: E402
+    extract_hospital_name, extract_modelo_heuristic, get_matcher, hospital_indicators, sentence_windows,
+)
+
+
+# ------------- versiones previas (V15 original, para comparar) -------------
+def legacy_extract_hospital_name(texto):
+    if not texto:
+        return ""
+    for h in hospital_indicators:
+        m = re.search(rf'({h}\s+[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúñ0-9\-\s]+(?:de\s+[A-ZÁÉÍÓÚÑ][A-Za-z]+)?)', texto, re.IGNORECASE)
+        if m:
+            return " ".join(m.group(1).split())
+    m2 = re.search(r'([A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúñ0-9\-\s]+ (Hospital|Hospital Regional|Sanatorio|Clínica))', texto)
+    if m2:
+        return m2.group(0).strip()
+    return ""
+
+
+def legacy_extract_modelo_heuristic(texto, marca):
+    if not texto:
+        return ""
+    modelo = ""
+    if marca:
+        m = re.search(rf'({re.escape(marca)})\s+([A-Za-z0-9\.\-\/]+(?:\s+[A-Za-z0-9\.\-\/]+){{0,3}})', texto, re.IGNORECASE)
+        if m:
+            modelo = (m.group(1) + " " + m.group(2)).strip()
+    if not modelo:
+        m2 = re.search(r'([A-Z][A-Za-z0-9\-]{3,}\s+\d{1,2}\.\d[A-Za-z0-9]*)', texto)
+        if m2:
+            modelo = m2.group(0).strip()
+    if not modelo:
+        m3 = re.search(r'(?:resonador|tomógrafo|tomografo|ecógrafo|mamógrafo)\s+([A-Z][A-Za-z0-9\-]{2,}(?:\s+[A-Za-z0-9\-]{1,3})?)', texto, re.IGNORECASE)
+        if m3:
+            modelo = m3.group(1).strip()
+    return modelo
+
+
+# ------------- textos sintéticos -------------
+FILLER = (
+    "La Provincia Anunció Nuevas Obras De Infraestructura En La Región Durante El Último Trimestre "
+    "y los vecinos participaron de la jornada con actividades culturales y deportivas"
+)
+# menús / pies de página: corridas largas de palabras sin puntuación (peor caso de backtracking)
+NAV = " ".join(["Inicio Productos Soluciones Noticias Prensa Contacto Empleos Legales Privacidad"] * 12)
+HITS = [
+    "El Hospital Regional de Neuquén incorporó un tomógrafo Siemens Somatom go.Up 64 cortes.",
+    "La Clínica San Martín instaló un resonador Philips Ingenia 1.5T en su nueva sala.",
+    # sin "ü": la versión previa no la aceptaba en los nombres ("Güemes" daba "El Sanatorio")
+    "El Sanatorio Otamendi adquirió un ecógrafo Mindray Resona 7 para el servicio de imágenes.",
+    # un indicador de menor prioridad antes de "Hospital": gana el Hospital, como en la versión previa
+    "La clínica San Martín y el Hospital Italiano instalaron un tomógrafo Siemens.",
+]
+
+
+def make_article(rng, paragraphs, with_hit):
+    parts = [NAV] + [FILLER + ("." if rng.random() < 0.5 else ",") for _ in range(paragraphs)] + [NAV]
+    if with_hit:
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice(HITS))
+    return " ".join(parts)
+
+
+def bench(label, fn, articles, marca):
+    t0 = time.perf_counter()
+    for a in articles:
+        fn(a, marca)
+    dt = time.perf_counter() - t0
+    print(f"{label:<12} {dt / len(articles) * 1000:8.3f} ms/artículo  ({dt:.2f} s total)")
+    return dt
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--articles", type=int, default=200)
+    ap.add_argument("--paragraphs", type=int, default=60)
+    args = ap.parse_args()
+
+    rng = random.Random(15)
+    # la mitad sin menciones: es el peor caso (todos los patrones recorren el texto completo)
+    articles = [make_article(rng, args.paragraphs, i % 2 == 0) for i in range(args.articles)]
+    avg_kb = sum(len(a) for a in articles) / len(articles) / 1024
+    print(f"{len(articles)} artículos sintéticos, {avg_kb:.1f} KB promedio\n")
+
+    def legacy(texto, marca):
+        return legacy_extract_hospital_name(texto), legacy_extract_modelo_heuristic(texto, marca)
+
+    def current(texto, marca):
+        return extract_hospital_name(texto), extract_modelo_heuristic(texto, marca)
+
+    # como en process_article_from_link: primero las oraciones alrededor de los términos detectados
+    matcher = get_matcher(["tomógrafo", "resonador", "ecógrafo"], ["Philips", "Siemens", "Mindray"], {})
+
+    # el scan ya se paga para tipo / marca / modalidad, así que queda fuera de la medición
+    spans = {id(a): matcher.scan(a)[1] for a in articles}
+
+    def windowed(texto, marca):
+        window = sentence_windows(texto, spans[id(texto)])
+        return extract_hospital_name(window) or extract_hospital_name(texto), extract_modelo_heuristic(window or texto, marca)
+
+    # la aceleración sólo cuenta si la salida es la misma
+    texts = articles + HITS
+    mismatches = [t for t in texts if legacy(t, "Philips") != current(t, "Philips")]
+    print(f"misma salida que la versión previa: {not mismatches} ({len(texts) - len(mismatches)}/{len(texts)})")
+    for t in mismatches[:3]:
+        print(f"  antes {legacy(t, 'Philips')!r}\n  ahora {current(t, 'Philips')!r}")
+    print()
+
+    before = bench("antes", legacy, articles, "Philips")
+    after = bench("después", current, articles, "Philips")
+    after_w = bench("+ ventanas", windowed, articles, "Philips")
+    print(f"\nspeedup: x{before / max(after, 1e-9):.1f} (regex) / x{before / max(after_w, 1e-9):.1f} (con ventanas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# bench_pipeline.py - benchmark offline del scraper completo y de sus funciones principales,
+# contra el servidor local de benchmarks/fixture_server.py (páginas grabadas, latencia y errores inyectados)
+# Uso: python benchmarks/bench_pipeline.py [--latency-ms 30] [--jitter-ms 20] [--error-rate 0.02] [--json reporte.json]
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import GOOGLE, LEADS, VENDORS, FixtureServer, LocalFetcher  # noqa: E402
+
+from extraction import extract_hospital_name, extract_modelo_heuristic  # noqa: E402
+from scraper import (  # noqa: E402
+    DEFAULT_HEADERS, linkedin_search_with_snippets, process_article_from_link, run_scrape,
+)
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def measure(name, fn, calls):
+    """Corre fn(i) 'calls' veces: throughput, latencias y pico de memoria (tracemalloc)."""
+    fn(-1)  # calentar: regex compilados, conexiones abiertas
+    latencies = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(calls):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    row = {
+        "bench": name,
+        "calls": calls,
+        "ops_s": round(calls / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(_percentile(latencies, 0.5) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+    print(f"{name:45s} {row['calls']:>6d} llamadas  {row['ops_s']:>10.1f} ops/s  "
+          f"p50 {row['p50_ms']:>9.3f} ms  p95 {row['p95_ms']:>9.3f} ms  pico {row['peak_kb']:>9.1f} KB")
+    return row
+
+
+def bench_functions(server, fetcher, repeat):
+    rows = []
+    texts = [lead for _, lead in LEADS]
+    rows.append(measure("extract_hospital_name", lambda i: extract_hospital_name(texts[i % len(texts)]), repeat * 10))
+    marcas = ["Philips", "Siemens", "Mindray", "GE", "Fujifilm", ""]
+    rows.append(measure("extract_modelo_heuristic",
+                        lambda i: extract_modelo_heuristic(texts[i % len(texts)], marcas[i % len(marcas)]), repeat * 10))
+    vendor = VENDORS[0]
+    rows.append(measure("process_article_from_link (distribuidor)", lambda i: process_article_from_link(
+        f"https://{vendor}/noticias/2024/{i}-bench", "Vendor A", DEFAULT_HEADERS, fetcher=fetcher), repeat))
+    rows.append(measure("process_article_from_link (LinkedIn, snippet)", lambda i: process_article_from_link(
+        f"https://www.linkedin.com/posts/bench-{i}", "LinkedIn", DEFAULT_HEADERS, snippet_text=texts[i % len(texts)],
+        fetcher=fetcher), repeat))
+    rows.append(measure("process_article_from_link (LinkedIn, sin snippet)", lambda i: process_article_from_link(
+        f"https://www.linkedin.com/posts/wall-{i}", "LinkedIn", DEFAULT_HEADERS, fetcher=fetcher), repeat))
+    pages = server.google_pages
+    rows.append(measure(f"linkedin_search_with_snippets ({pages} páginas)", lambda i: linkedin_search_with_snippets(
+        [f"resonador{i}", "tomógrafo"], pages_to_check=pages, fetcher=fetcher), max(1, repeat // 10)))
+    return rows
+
+
+def bench_pipeline(server, fetcher, args):
+    sites = {f"Vendor {chr(65 + i)}": f"https://{host}/noticias" for i, host in enumerate(VENDORS)}
+    if not args.html_only:
+        # un distribuidor con feed RSS y otro con la API de WordPress (ver sources.py)
+        sites = {"Vendor A": {"url": sites["Vendor A"], "feed": f"https://{VENDORS[0]}/feed.xml"},
+                 "Vendor B": {"url": sites["Vendor B"], "api": "wordpress"}}
+    before = dict(server.requests)
+    tracemalloc.start()
+    start = time.perf_counter()
+    df, stats = run_scrape(pages_ln=args.pages, sites=sites, max_links_per_site=args.max_links,
+                           extraction_workers=args.workers, fetcher=fetcher)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    requests_made = {h: server.requests[h] - before[h] for h in server.requests}
+    links = stats["processed"]
+    row = {
+        "bench": "run_scrape (pipeline completo)",
+        "seconds": round(elapsed, 3),
+        "links": links,
+        "links_s": round(links / elapsed, 1) if elapsed else 0,
+        "rows": len(df),
+        "requests": requests_made,
+        "peak_kb": round(peak / 1024, 1),
+        # incluye los procesos de extracción (RUSAGE_CHILDREN); ru_maxrss está en KB en Linux
+        "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "maxrss_children_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        "stats": {k: v for k, v in stats.items() if k != "report"},
+        "stages": {name: {k: s[k] for k in ("count", "mean_ms", "p50_ms", "p95_ms", "total_s")}
+                   for name, s in stats["report"]["stages"].items()},
+        "errors": stats["report"]["errors"],
+    }
+    print(f"\nrun_scrape: {elapsed:.2f} s, {links} enlaces ({row['links_s']} enlaces/s), {len(df)} filas, "
+          f"pedidos {sum(requests_made.values())} ({', '.join(f'{h}: {n}' for h, n in requests_made.items())})")
+    print(f"memoria: pico Python {row['peak_kb']:.0f} KB, maxrss {row['maxrss_kb']} KB (procesos hijos {row['maxrss_children_kb']} KB)")
+    for name, s in row["stages"].items():
+        print(f"  {name:22s} n={s['count']:<5d} media {s['mean_ms']:>9.2f} ms  p95 {s['p95_ms']:>7} ms  total {s['total_s']:.2f} s")
+    if row["errors"]:
+        print(f"  errores: {row['errors']}")
+    if args.html_only and not stats["fetched"]:
+        raise SystemExit("--html-only no descargó ninguna nota: el benchmark no midió descarga ni extracción")
+    return row
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark offline con páginas grabadas servidas localmente.")
+    ap.add_argument("--latency-ms", type=float, default=30, help="demora base por respuesta")
+    ap.add_argument("--jitter-ms", type=float, default=20, help="demora extra aleatoria (0..jitter)")
+    ap.add_argument("--error-rate", type=float, default=0.02, help="fracción de respuestas 500")
+    ap.add_argument("--block-after", type=int, default=None, help="Google bloquea (429 + captcha) después de N pedidos")
+    ap.add_argument("--repeat", type=int, default=50, help="llamadas por benchmark de función (x10 en los de regex)")
+    ap.add_argument("--pages", type=int, default=2, help="páginas de Google por consulta en el pipeline completo")
+    ap.add_argument("--max-links", type=int, default=30, help="máx. enlaces por sitio en el pipeline completo")
+    ap.add_argument("--workers", type=int, default=None, help="procesos de extracción del pipeline (0 = en el mismo proceso)")
+    ap.add_argument("--host-delay", type=float, default=0.25, help="pausa por host del Fetcher (la de producción es 0.25)")
+    ap.add_argument("--google-delay", type=float, default=0.3, help="pausa entre pedidos a Google (la de producción es 0.3)")
+    ap.add_argument("--html-only", action="store_true",
+                    help="sitios sólo con el listado HTML (sin feed / API declarados ni anunciados): "
+                         "mide la descarga, el parseo y el pool de extracción de las notas")
+    ap.add_argument("--skip-functions", action="store_true", help="sólo el pipeline completo")
+    ap.add_argument("--skip-pipeline", action="store_true", help="sólo las funciones")
+    ap.add_argument("--json", default=None, help="guardar los resultados en este archivo")
+    args = ap.parse_args()
+
+    results = {"config": vars(args), "functions": [], "pipeline": None}
+    with FixtureServer(args.latency_ms, args.jitter_ms, args.error_rate, block_after=args.block_after,
+                       feed_link=not args.html_only) as server:
+        # misma configuración que run_scrape, pero sin caché: se mide la red local en cada corrida
+        fetcher = LocalFetcher(server, headers=DEFAULT_HEADERS, max_workers=16, max_per_host=2,
+                               host_delay=args.host_delay, host_overrides={f"127.0.0.1:{server.ports[GOOGLE]}": args.google_delay})
+        print(f"latencia {args.latency_ms:.0f}+{args.jitter_ms:.0f} ms, errores {args.error_rate:.0%}, "
+              f"pausa por host {args.host_delay} s (Google {args.google_delay} s)\n")
+        if not args.skip_functions:
+            results["functions"] = bench_functions(server, fetcher, args.repeat)
+        if not args.skip_pipeline:
+            results["pipeline"] = bench_pipeline(server, fetcher, args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
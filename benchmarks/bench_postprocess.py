@@ -0,0 +1,94 @@
+# bench_postprocess.py - post-proceso del DataFrame de resultados (confianza, fechas, orden)
+# Uso: python benchmarks/bench_postprocess.py [--rows 10000 100000]
+import argparse
+import os
+import random
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import compute_confidence, confidence_scores, parse_fecha  # noqa: E402
+from scraper import build_results_df, sort_results  # noqa: E402
+
+
+# ------------- versión previa (fila por fila, para comparar) -------------
+def legacy_build_results_df(collected):
+    df = pd.DataFrame(collected).drop_duplicates(subset=["Link"]).reset_index(drop=True)
+    df["Confianza"] = df.apply(compute_confidence, axis=1)
+
+    def parse_fecha_sort(x):
+        if isinstance(x, str) and x.startswith("*") and x.endswith("*"):
+            return pd.NaT
+        try:
+            return pd.to_datetime(x, errors="coerce")
+        except Exception:
+            return pd.NaT
+    df["Fecha_dt"] = df["Fecha instalación"].apply(parse_fecha_sort)
+    return df.sort_values(by=["Confianza", "Fecha_dt"], ascending=[False, False]).drop(columns=["Fecha_dt"])
+
+
+def vectorized_postprocess(collected):
+    # el mismo trabajo que la versión previa (sin agrupar eventos: ver collapse_duplicates)
+    df = pd.DataFrame(collected).drop_duplicates(subset=["Link"]).reset_index(drop=True)
+    df["Confianza"] = confidence_scores(df)
+    return sort_results(df)
+
+
+def make_rows(n, rng):
+    rows = []
+    for i in range(n):
+        r = rng.random()
+        if r < 0.6:
+            fecha = f"{rng.randint(2015, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        elif r < 0.9:
+            fecha = "*2026-10-17*"
+        elif r < 0.97:
+            fecha = f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/2024"
+        else:
+            fecha = ""
+        rows.append({
+            "Tipo": "resonador", "Modelo": rng.choice(["", "Ingenia 1.5T"]), "Modalidad": "MR",
+            "Fecha instalación": fecha, "Ubicación (Hospital)": rng.choice(["", "Hospital Italiano"]),
+            "Marca": rng.choice(["", "Philips", "GE"]), "Fuente": "LinkedIn", "Título": f"post {i}",
+            "Link": f"https://www.linkedin.com/posts/{i % int(n * 0.95) if n > 20 else i}", "Confianza": 0,
+        })
+    return rows
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = ap.parse_args()
+    rng = random.Random(11)
+    # pandas avisa por cada dd/mm/aaaa sin dayfirst (comportamiento de la versión previa)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    for n in args.rows:
+        rows = make_rows(n, rng)
+        old, t_old = timed(legacy_build_results_df, rows)
+        new, t_new = timed(vectorized_postprocess, rows)
+        same = old["Link"].tolist() == new["Link"].tolist() and old["Confianza"].tolist() == new["Confianza"].tolist()
+        print(f"{n:>7} filas  antes {t_old:7.3f} s   después {t_new:7.3f} s   x{t_old / max(t_new, 1e-9):5.1f}   mismo orden: {same}")
+        # build_results_df completo: además agrupa los eventos repetidos (dedupe.collapse_duplicates)
+        full, t_full = timed(build_results_df, rows)
+        print(f"{'':>7}        build_results_df (con agrupación de eventos) {t_full:7.3f} s, {len(full)} filas")
+
+    # fecha suelta (como en extract_article): pd.to_datetime vs parser de formato fijo
+    fechas = [r["Fecha instalación"].strip("*") or "2024-01-01" for r in make_rows(10_000, rng)]
+    _, t_pd = timed(lambda: [pd.to_datetime(f, errors="coerce") for f in fechas])
+    _, t_fast = timed(lambda: [parse_fecha(f) for f in fechas])
+    print(f"\n10000 fechas sueltas  pd.to_datetime {t_pd:.3f} s   parse_fecha {t_fast:.3f} s   x{t_pd / max(t_fast, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    main()
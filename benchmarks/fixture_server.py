@@ -0,0 +1,249 @@
+# fixture_server.py - servidor HTTP local que imita a Google, LinkedIn y sitios de distribuidores
+# con las páginas grabadas de benchmarks/fixtures, para medir el scraper sin salir a internet.
+# Uso directo: python benchmarks/fixture_server.py [--latency-ms 30] [--error-rate 0.05]
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse, urlunparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher import Fetcher  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+GOOGLE = "www.google.com"
+LINKEDIN = "www.linkedin.com"
+VENDORS = ("vendor-a.example", "vendor-b.example")
+
+# primer párrafo de cada nota de distribuidor (se repiten en ciclo); la última no califica
+LEADS = [
+    ("Nuevo resonador en Córdoba", "El Hospital Italiano de Córdoba instaló un resonador Philips Ingenia 1.5T en su servicio de diagnóstico por imágenes."),
+    ("Tomógrafo para la guardia", "El Sanatorio Güemes incorporó un tomógrafo Siemens Somatom go.Up de 64 cortes para la guardia central."),
+    ("Ecografía de alta gama en Mendoza", "La Clínica San Martín adquirió un ecógrafo Mindray Resona 7 para obstetricia y cardiología."),
+    ("Hemodinamia en Neuquén", "El Hospital Regional de Neuquén estrenó un angiografo GE Innova IGS 520 para su sala de hemodinamia."),
+    ("Mamografía con tomosíntesis", "La Clínica del Sol sumó un mamógrafo Fujifilm Amulet Innovality con tomosíntesis digital."),
+    ("Participamos de la Expo Salud", "La empresa participó de la Expo Salud con un stand de soluciones de monitoreo y capacitaciones."),
+]
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _fill(template, **values):
+    # str.replace y no str.format: las plantillas tienen llaves de CSS / JSON-LD
+    for key, value in values.items():
+        template = template.replace("{" + key + "}", str(value))
+    return template
+
+
+class FixtureServer:
+    """
+    Un servidor por host imitado (Google, LinkedIn y dos distribuidores), cada uno en su
+    puerto de 127.0.0.1, así el limitador por host del Fetcher se comporta como en la red.
+    'latency_ms' + hasta 'jitter_ms' de demora por respuesta, 'error_rate' de respuestas 500,
+    y con 'block_after' Google responde 429 + captcha a partir de ese pedido.
+    Con feed_link=False los listados no anuncian /feed.xml (sitios sólo con HTML).
+    rewrite(url) traduce una URL real (https://www.google.com/search?...) a la del servidor local.
+    """
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, google_pages=3, block_after=None,
+                 news_pages=3, per_page=12, seed=1, feed_link=True):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.google_pages = google_pages
+        self.block_after = block_after
+        self.news_pages = news_pages
+        self.per_page = per_page
+        self.feed_link = feed_link
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = {host: 0 for host in (GOOGLE, LINKEDIN) + VENDORS}
+        self.ports = {}
+        self._servers = []
+        self._pages = {
+            "serp": _fixture("google_serp.html"),
+            "empty": _fixture("google_empty.html"),
+            "sorry": _fixture("google_sorry.html"),
+            "wall": _fixture("linkedin_login_wall.html"),
+            "news": _fixture("vendor_news.html"),
+            "article": _fixture("vendor_article.html"),
+            "feed": _fixture("vendor_feed.xml"),
+            "sitemap": _fixture("vendor_sitemap.xml"),
+        }
+
+    # ------------- ciclo de vida -------------
+    def start(self):
+        for host in self.requests:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler(host))
+            server.daemon_threads = True
+            self.ports[host] = server.server_address[1]
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def rewrite(self, url):
+        p = urlparse(url)
+        port = self.ports.get((p.hostname or "").lower())
+        if port is None:
+            return url
+        return urlunparse(("http", f"127.0.0.1:{port}", p.path, p.params, p.query, ""))
+
+    # ------------- respuestas -------------
+    def _chaos(self):
+        """(demora en s, inyectar error) para la próxima respuesta."""
+        with self._lock:
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            return delay, self._rng.random() < self.error_rate
+
+    def _google(self, path, query):
+        with self._lock:
+            n = self.requests[GOOGLE]
+        if self.block_after is not None and n > self.block_after:
+            return 429, "text/html", self._pages["sorry"]
+        start = int(query.get("start", ["0"])[0])
+        if not path.startswith("/search") or start >= self.google_pages * 10:
+            return 200, "text/html", self._pages["empty"]
+        # las URLs de los posts se renumeran por página (y por consulta) para que no se repitan
+        return 200, "text/html", _fill(self._pages["serp"], start=f"{zlib.crc32(query.get('q', [''])[0].encode()) % 997}-{start}")
+
+    def _article_ids(self, page):
+        first = (page - 1) * self.per_page
+        return range(first, first + self.per_page)
+
+    @staticmethod
+    def _path(i):
+        return f"/noticias/2024/{i}-{LEADS[i % len(LEADS)][0].lower().replace(' ', '-')}"
+
+    @staticmethod
+    def _date(i):
+        return datetime(2024, (i % 12) + 1, (i % 27) + 1, 10, 0, tzinfo=timezone.utc)
+
+    def _vendor(self, host, path, query):
+        base = f"https://{host}"
+        if path in ("/noticias", "/news"):
+            page = int(query.get("page", ["1"])[0])
+            items = "\n".join(f'<li><a href="{self._path(i)}">{LEADS[i % len(LEADS)][0]}</a></li>'
+                               for i in self._article_ids(page))
+            nxt = f'<a href="/noticias?page={page + 1}">Siguiente</a>' if page < self.news_pages else ""
+            feed = '<link rel="alternate" type="application/rss+xml" title="Noticias" href="/feed.xml">' if self.feed_link else ""
+            return 200, "text/html", _fill(self._pages["news"], items=items, next=nxt, feed_link=feed)
+        if path.startswith("/noticias/"):
+            try:
+                i = int(path.rsplit("/", 1)[1].split("-", 1)[0])
+            except ValueError:
+                return 404, "text/html", "<html><body><p>No encontrado</p></body></html>"
+            title, lead = LEADS[i % len(LEADS)]
+            return 200, "text/html", _fill(self._pages["article"], title=title, lead=lead, date=self._date(i).strftime("%Y-%m-%d"))
+        ids = range(self.per_page * self.news_pages)
+        if path == "/feed.xml":
+            # RSS 2.0: fecha RFC 822 y el primer párrafo como description
+            items = "\n".join(
+                f"<item><title>{LEADS[i % len(LEADS)][0]}</title><link>{base}{self._path(i)}</link>"
+                f"<pubDate>{format_datetime(self._date(i))}</pubDate>"
+                f"<description>{escape('<p>' + LEADS[i % len(LEADS)][1] + '</p>')}</description></item>"
+                for i in ids)
+            return 200, "application/rss+xml", _fill(self._pages["feed"], base=base, items=items)
+        if path == "/wp-json/wp/v2/posts":
+            # API REST de WordPress (ver sources.API_PRESETS)
+            posts = [{"link": f"{base}{self._path(i)}", "title": {"rendered": LEADS[i % len(LEADS)][0]},
+                      "date": self._date(i).strftime("%Y-%m-%dT%H:%M:%S"),
+                      "content": {"rendered": f"<p>{LEADS[i % len(LEADS)][1]}</p>"}} for i in ids]
+            return 200, "application/json", json.dumps(posts, ensure_ascii=False)
+        if path == "/sitemap.xml":
+            items = "\n".join(f"<url><loc>{base}{self._path(i)}</loc></url>" for i in ids)
+            return 200, "application/xml", _fill(self._pages["sitemap"], base=base, items=items)
+        return 404, "text/html", "<html><body><p>No encontrado</p></body></html>"
+
+    def _handler(self, host):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como los sitios reales
+            # headers y cuerpo salen en dos escrituras: sin esto Nagle + ACK diferido suman ~40 ms por respuesta
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.requests[host] += 1
+                delay, fail = fixture._chaos()
+                if delay:
+                    time.sleep(delay)
+                p = urlparse(self.path)
+                query = parse_qs(p.query)
+                if fail:
+                    status, ctype, body = 500, "text/html", "<html><body>Internal Server Error</body></html>"
+                elif host == GOOGLE:
+                    status, ctype, body = fixture._google(p.path, query)
+                elif host == LINKEDIN:
+                    status, ctype, body = 200, "text/html", fixture._pages["wall"]
+                else:
+                    status, ctype, body = fixture._vendor(host, p.path, query)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class LocalFetcher(Fetcher):
+    """Fetcher que manda cada pedido al FixtureServer en vez de a internet."""
+
+    def __init__(self, server, **kwargs):
+        super().__init__(**kwargs)
+        self.server = server
+
+    def get(self, url, kind=None, **kwargs):
+        return super().get(self.server.rewrite(url), kind=kind, **kwargs)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Servidor local con las páginas grabadas (Google, LinkedIn, distribuidores).")
+    ap.add_argument("--latency-ms", type=float, default=0)
+    ap.add_argument("--jitter-ms", type=float, default=0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--block-after", type=int, default=None, help="Google responde 429 + captcha después de N pedidos")
+    args = ap.parse_args()
+    with FixtureServer(args.latency_ms, args.jitter_ms, args.error_rate, block_after=args.block_after) as server:
+        for host, port in server.ports.items():
+            print(f"{host:20s} -> http://127.0.0.1:{port}/")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# cli.py - Scraper Electromedicina V15 sin Streamlit (cron / workers)
+# Ejemplo: python cli.py --pages 2 --keywords "resonador,angiografo" --output resultados.jsonl
+import argparse
+import json
+import os
+import sys
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Scraper Electromedicina V15 (headless): LinkedIn vía Google + sitios institucionales.")
+    ap.add_argument("--pages", type=int, default=1, help="páginas de Google Search (LinkedIn) por consulta (la búsqueda se reparte en consultas por modalidad, marca y acción)")
+    ap.add_argument("--google-pages", type=int, default=None,
+                    help="tope total de páginas de Google por corrida, sumando todas las consultas "
+                         "(por defecto GOOGLE_PAGE_BUDGET de scraper.py)")
+    ap.add_argument("--no-institutional", action="store_true", help="no recorrer sitios institucionales / distribuidores")
+    ap.add_argument("--site", action="append", metavar="ETIQUETA=URL",
+                    help="sitio institucional a recorrer (repetible; reemplaza la lista por defecto)")
+    ap.add_argument("--feed", action="append", metavar="ETIQUETA=URL",
+                    help="feed RSS/Atom de un sitio (repetible; misma etiqueta que --site o nueva fuente sólo con feed): "
+                         "sus notas se leen del feed sin descargar cada página")
+    ap.add_argument("--comprar", action="store_true", help="incluir COMPR.AR (licitaciones)")
+    ap.add_argument("--max-links", type=int, default=60, help="máx. enlaces por sitio institucional")
+    ap.add_argument("--keywords", default="", help="palabras clave adicionales, separadas por coma")
+    ap.add_argument("--output", "-o", default="resultados_scraper_v15.csv", help="archivo de salida: .csv, .parquet o .jsonl")
+    ap.add_argument("--stream", default=None,
+                    help="archivo .jsonl/.csv donde se agregan las filas a medida que aparecen "
+                         "(por defecto <output>.partial.jsonl; se borra al terminar bien)")
+    ap.add_argument("--workers", type=int, default=None, help="procesos de extracción (0 = en el mismo proceso; por defecto, uno por core)")
+    ap.add_argument("--no-cache", action="store_true", help="no usar la caché HTTP local")
+    ap.add_argument("--incremental", action="store_true", help="procesar sólo enlaces nuevos o cambiados y exportar el histórico")
+    ap.add_argument("--recheck-days", type=int, default=7, help="en modo incremental, revisar enlaces ya vistos cada N días (0 = nunca)")
+    ap.add_argument("--report", default=None, help="archivo .json donde guardar el reporte de la corrida (tiempos por etapa, bytes, caché, errores)")
+    ap.add_argument("--quiet", "-q", action="store_true", help="no mostrar el avance")
+    return ap.parse_args(argv)
+
+
+def parse_sites(values):
+    sites = {}
+    for v in values:
+        label, sep, url = v.partition("=")
+        if not sep or not url.strip():
+            raise SystemExit(f"--site inválido: {v!r} (se espera ETIQUETA=URL)")
+        sites[label.strip()] = url.strip()
+    return sites
+
+
+def with_feeds(sites, values):
+    """Agrega a 'sites' los feeds de --feed: {"url", "feed"} si la etiqueta ya existe, sólo feed si no."""
+    sites = dict(sites)
+    for label, feed in parse_sites(values).items():
+        current = sites.get(label)
+        spec = dict(current) if isinstance(current, dict) else {"url": current}
+        spec["feed"] = feed
+        sites[label] = spec
+    return sites
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # imports diferidos: --help no paga la carga de pandas / bs4
+    from http_cache import HttpCache
+    from scraper import GOOGLE_PAGE_BUDGET, institutional_sites, run_scrape, write_results
+    from sinks import open_sink
+    from store import ResultStore
+
+    def status(texto):
+        if not args.quiet:
+            print(texto, file=sys.stderr)
+
+    def progress(done, total):
+        if not args.quiet and (done == total or done % 10 == 0):
+            print(f"  {done}/{total}", file=sys.stderr)
+
+    # las filas van a disco apenas se extraen: si la corrida se corta no se pierden,
+    # y la próxima corrida las retoma desde el mismo archivo parcial
+    stream_path = args.stream or args.output + ".partial.jsonl"
+    sink = open_sink(stream_path)
+    sites = parse_sites(args.site) if args.site else None
+    if args.feed:
+        sites = with_feeds(institutional_sites if sites is None else sites, args.feed)
+
+    df, stats = run_scrape(
+        pages_ln=args.pages,
+        google_pages=GOOGLE_PAGE_BUDGET if args.google_pages is None else args.google_pages,
+        include_institutional=not args.no_institutional,
+        include_comprar=args.comprar,
+        max_links_per_site=args.max_links,
+        custom_keywords=args.keywords,
+        sites=sites,
+        http_cache=None if args.no_cache else HttpCache(),
+        store=ResultStore() if args.incremental else None,
+        recheck_days=args.recheck_days,
+        extraction_workers=args.workers,
+        on_status=status,
+        on_progress=progress,
+        sink=sink,
+    )
+    sink.close()
+    write_results(df, args.output)
+    if not args.stream:
+        os.remove(stream_path)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(stats["report"], f, ensure_ascii=False, indent=2)
+    for host, n in stats["blocked"].items():
+        print(f"aviso: {host} bloqueó la corrida (429 / captcha, {n} vez/veces); se dejó de consultar", file=sys.stderr)
+    status(f"{len(df)} filas en {args.output} (nuevas: {stats['new']}, enlaces procesados: {stats['processed']}, errores: {stats['errors']}, duplicados omitidos: {stats['duplicates']}, descargados: {stats['fetched']}, por snippet: {stats['from_snippet']}, por feed / API: {stats['from_feed']}, descartados: {stats['skipped']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# dedupe.py - huellas de contenido (SimHash) y colapso de filas que describen el mismo evento
+import re
+import threading
+import unicodedata
+import zlib
+
+import numpy as np
+import pandas as pd
+
+SIMHASH_BITS = 64
+# distancia de Hamming máxima para considerar dos textos casi iguales
+MAX_DISTANCE = 3
+# con MAX_DISTANCE + 1 bandas, dos huellas a distancia <= MAX_DISTANCE comparten al menos una banda
+_BANDS = MAX_DISTANCE + 1
+_BAND_BITS = SIMHASH_BITS // _BANDS
+
+_WORD_RE = re.compile(r"\w+")
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def _strip_accents(texto):
+    # NFKD y descartar lo que no es ASCII: quita los acentos (y símbolos sueltos, que no forman palabras)
+    if texto.isascii():
+        return texto
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def _shingle_hash(shingle):
+    # hash estable entre procesos (hash() de Python cambia con PYTHONHASHSEED)
+    data = shingle.encode("utf-8")
+    return zlib.crc32(data) | (zlib.crc32(data, 0x9E3779B9) << 32)
+
+
+def simhash(texto, shingle_size=3):
+    """Huella SimHash de 64 bits sobre shingles de palabras (minúsculas, sin acentos)."""
+    words = _WORD_RE.findall(_strip_accents((texto or "").lower()))
+    if not words:
+        return 0
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    # votos por bit de todos los shingles a la vez (numpy) en vez de 64 pasos por shingle
+    hashes = np.fromiter((_shingle_hash(sh) for sh in shingles), dtype=np.uint64, count=len(shingles))
+    ones = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).sum(axis=0)
+    bits = ones * 2 > len(shingles)
+    return int((bits.astype(np.uint64) << _BIT_SHIFTS).sum())
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class SimhashIndex:
+    """
+    Índice de huellas por bandas: find() sólo compara contra las huellas que comparten
+    alguna banda de bits, en vez de contra todas.
+    """
+
+    def __init__(self, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bands(self, h):
+        mask = (1 << _BAND_BITS) - 1
+        return [(i, (h >> (i * _BAND_BITS)) & mask) for i in range(_BANDS)]
+
+    def find(self, h):
+        """Clave de una huella casi igual ya indexada, o None."""
+        with self._lock:
+            for band in self._bands(h):
+                for other, key in self._buckets.get(band, ()):
+                    if hamming(h, other) <= self.max_distance:
+                        return key
+        return None
+
+    def add(self, h, key):
+        with self._lock:
+            for band in self._bands(h):
+                self._buckets.setdefault(band, []).append((h, key))
+
+    def seen(self, h, key):
+        """True si ya había una huella casi igual; si no, la agrega."""
+        if self.find(h) is not None:
+            return True
+        self.add(h, key)
+        return False
+
+
+def normalize_hospital(nombre, max_words=4):
+    """Clave del hospital: minúsculas, sin acentos y sólo las primeras palabras (el regex suele arrastrar texto)."""
+    words = _WORD_RE.findall(_strip_accents((nombre or "").lower()))
+    return " ".join(words[:max_words])
+
+
+def collapse_duplicates(df):
+    """
+    Une en un solo registro las filas casi iguales (columna "Huella", si existe) o que
+    describen el mismo evento (hospital + modalidad + marca). Queda la fila de mayor
+    Confianza, con "Fuentes" (todas las fuentes) y "Links relacionados" (los demás links).
+    """
+    if df.empty:
+        return df
+    df = df.reset_index(drop=True)
+    parent = list(range(len(df)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = root(i), root(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    if "Huella" in df.columns:
+        index = SimhashIndex()
+        for i, h in enumerate(df["Huella"]):
+            if not isinstance(h, str) or not h:
+                continue
+            h = int(h, 16)
+            j = index.find(h)
+            if j is not None:
+                union(i, j)
+            else:
+                index.add(h, i)
+
+    hosp = df["Ubicación (Hospital)"].fillna("").map(normalize_hospital)
+    event = hosp + "|" + df["Modalidad"].fillna("") + "|" + df["Marca"].fillna("").str.lower()
+    has_event = (hosp != "") & (df["Modalidad"].fillna("") != "")
+    for _, idx in event[has_event].groupby(event[has_event]).groups.items():
+        idx = list(idx)
+        for j in idx[1:]:
+            union(idx[0], j)
+
+    groups = pd.Series([root(i) for i in range(len(df))], index=df.index)
+    if groups.nunique() == len(df):
+        df["Fuentes"] = df["Fuente"]
+        df["Links relacionados"] = ""
+        return df
+    best = df.assign(_g=groups).sort_values("Confianza", ascending=False, kind="stable").groupby("_g").head(1)
+    fuentes = df["Fuente"].groupby(groups).agg(lambda s: " | ".join(dict.fromkeys(s)))
+    links = df["Link"].groupby(groups).agg(list)
+    best = best.set_index("_g")
+    best["Fuentes"] = fuentes
+    best["Links relacionados"] = [
+        " | ".join(l for l in links[g] if l != link) for g, link in zip(best.index, best["Link"])
+    ]
+    return best.reset_index(drop=True)
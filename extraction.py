@@ -0,0 +1,477 @@
+# extraction.py - detección de equipo / marca / modalidad en una sola pasada y
+# extracción de hospital / modelo con regex precompilados
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+
+from dedupe import simhash
+from parsing import parse_article
+from store import content_hash
+
+hospital_indicators = [
+    "Hospital", "Hospital Provincial", "Hospital Regional", "Hospital Municipal", "Hospital Público",
+    "Clínica", "Sanatorio", "Centro de Salud", "Instituto", "Fundación", "Fundacion"
+]
+
+
+# términos de hasta este largo (tc, GE, pet) exigen límite de palabra a ambos lados;
+# los más largos admiten plural ("tomógrafos", "resonadores")
+SHORT_TERM_CHARS = 3
+
+
+class KeywordMatcher:
+    """
+    Un único regex con todos los términos (más largos primero) y límites de palabra,
+    para que "tc", "GE" o "pet" no coincidan dentro de otras palabras; los términos
+    largos aceptan además el plural (-s / -es).
+    'spec' es una tupla de (categoria, ((termino, valor), ...)); el orden de los
+    términos es la prioridad, igual que en las listas originales.
+    """
+
+    def __init__(self, spec):
+        self.categories = [name for name, _ in spec]
+        self.terms = {}  # termino en minúscula -> [(categoria, prioridad, valor)]
+        for name, pairs in spec:
+            for prio, (term, value) in enumerate(pairs):
+                key = term.strip().lower()
+                if key:
+                    self.terms.setdefault(key, []).append((name, prio, value))
+        ordered = sorted(self.terms, key=len, reverse=True)
+        # grupo 1: términos largos (+ plural), grupo 2: cortos; "(?!)" no coincide nunca
+        long_alt = "|".join(re.escape(t) for t in ordered if len(t) > SHORT_TERM_CHARS) or "(?!)"
+        short_alt = "|".join(re.escape(t) for t in ordered if len(t) <= SHORT_TERM_CHARS) or "(?!)"
+        self.regex = (re.compile(rf"(?<!\w)(?:({long_alt})(?:e?s)?|({short_alt}))(?!\w)", re.IGNORECASE)
+                      if ordered else None)
+
+    def match(self, texto):
+        """Devuelve {categoria: valor} con el término de mayor prioridad presente en el texto ("" si no hay)."""
+        return self.scan(texto)[0]
+
+    def scan(self, texto):
+        """Como match(), pero devuelve además las posiciones (inicio, fin) de los términos encontrados."""
+        best = {name: (None, "") for name in self.categories}
+        spans = []
+        if not texto or self.regex is None:
+            return {name: "" for name in self.categories}, spans
+        for m in self.regex.finditer(texto):
+            spans.append(m.span())
+            term = m.group(1) or m.group(2)
+            for name, prio, value in self.terms.get(term.lower(), ()):
+                cur = best[name][0]
+                if cur is None or prio < cur:
+                    best[name] = (prio, value)
+        return {name: value for name, (_, value) in best.items()}, spans
+
+
+@lru_cache(maxsize=32)
+def _compile(spec):
+    return KeywordMatcher(spec)
+
+
+def get_matcher(equipos, marcas, modalidades):
+    """Matcher combinado para tipo, marca y modalidad; sólo se recompila si cambian las listas (ej. custom_keywords)."""
+    spec = (
+        ("tipo", tuple((k, k) for k in equipos)),
+        ("marca", tuple((k, k) for k in marcas)),
+        ("modalidad", tuple((t, mod) for mod, terms in modalidades.items() for t in terms)),
+    )
+    return _compile(spec)
+
+
+def first_keyword(keywords, texto):
+    """Primer keyword (en orden de la lista) presente como palabra en el texto."""
+    return _compile((("k", tuple((k, k) for k in keywords)),)).match(texto)["k"]
+
+
+# ------------- HOSPITAL / MODELO (regex compilados una sola vez) -------------
+# cuantificadores acotados: un nombre o modelo no pasa de unas decenas de caracteres,
+# así evitamos recorrer (y retroceder sobre) párrafos enteros
+_NAME_CHARS = r"A-Za-zÁÉÍÓÚÑÜáéíóúñü0-9\-"
+_HOSPITAL_RE = re.compile(
+    rf"(?:{'|'.join(re.escape(h) for h in sorted(hospital_indicators, key=len, reverse=True))})"
+    rf"\s+[A-ZÁÉÍÓÚÑÜ][{_NAME_CHARS}\s]{{1,80}}(?:de\s+[A-ZÁÉÍÓÚÑ][A-Za-z]{{1,30}})?",
+    re.IGNORECASE,
+)
+# "... Hospital" al final del nombre: se ubica primero el sufijo y se mira hacia atrás,
+# en vez de probar el patrón desde cada mayúscula del texto
+_HOSPITAL_SUFFIX_RE = re.compile(r" (?:Hospital Regional|Hospital|Sanatorio|Clínica)")
+_HOSPITAL_PREFIX_RE = re.compile(rf"[A-ZÁÉÍÓÚÑÜ][{_NAME_CHARS}\s]{{1,80}}$")
+_MODELO_VERSION_RE = re.compile(r"[A-Z][A-Za-z0-9\-]{3,40}\s+\d{1,2}\.\d[A-Za-z0-9]{0,10}")
+_MODELO_EQUIPO_RE = re.compile(
+    r"(?:resonador|tomógrafo|tomografo|ecógrafo|mamógrafo)\s+([A-Z][A-Za-z0-9\-]{2,40}(?:\s+[A-Za-z0-9\-]{1,3})?)",
+    re.IGNORECASE,
+)
+_SENTENCE_END_RE = re.compile(r"[.!?\n]+\s")
+
+# localizadores sin IGNORECASE sobre el texto en minúsculas: el motor de re es mucho más
+# rápido así, y el patrón completo sólo se prueba en las posiciones candidatas
+_HOSPITAL_LOC = re.compile("|".join(re.escape(h.lower()) for h in sorted(hospital_indicators, key=len, reverse=True)))
+_MODELO_EQUIPO_LOC = re.compile(r"resonador|tomógrafo|tomografo|ecógrafo|mamógrafo")
+
+
+def _located(texto, locator, pattern, overlapping=False):
+    """
+    Equivalente a pattern.finditer(texto) para patrones que empiezan con un término de 'locator'.
+    Con overlapping=True prueba desde cada término, aunque caiga dentro de una coincidencia anterior.
+    """
+    lowered = texto.lower()
+    if len(lowered) != len(texto):  # minúsculas que cambian el largo: sin atajo
+        if not overlapping:
+            yield from pattern.finditer(texto)
+            return
+        m = pattern.search(texto)
+        while m:
+            yield m
+            m = pattern.search(texto, m.start() + 1)
+        return
+    pos = 0
+    for loc in locator.finditer(lowered):
+        if loc.start() < pos:
+            continue
+        m = pattern.match(texto, loc.start())
+        if m:
+            if not overlapping:
+                pos = m.end()
+            yield m
+
+
+def _indicator_priority(found):
+    # mismo orden de preferencia que hospital_indicators ("Hospital ..." gana a "Clínica ...")
+    found = found.lower()
+    for prio, h in enumerate(hospital_indicators):
+        if found.startswith(h.lower()):
+            return prio
+    return len(hospital_indicators)
+
+
+@lru_cache(maxsize=None)
+def _brand_pattern(marca):
+    # tabla marca -> (localizador, patrón), compilados la primera vez que aparece cada marca
+    return (
+        re.compile(re.escape(marca.lower())),
+        re.compile(rf"({re.escape(marca)})\s+([A-Za-z0-9\.\-\/]{{1,40}}(?:\s+[A-Za-z0-9\.\-\/]{{1,40}}){{0,3}})", re.IGNORECASE),
+    )
+
+
+def sentence_windows(texto, spans, context=1):
+    """
+    Fragmento del texto con las oraciones que contienen algún span (más 'context'
+    oraciones vecinas a cada lado). Devuelve "" si no hay spans.
+    """
+    if not texto or not spans:
+        return ""
+    bounds = [0] + [m.end() for m in _SENTENCE_END_RE.finditer(texto)] + [len(texto)]
+    keep = set()
+    i = 0
+    for start, _ in sorted(spans):
+        while i + 1 < len(bounds) - 1 and bounds[i + 1] <= start:
+            i += 1
+        keep.update(range(max(0, i - context), min(len(bounds) - 1, i + context + 1)))
+    return " ".join(texto[bounds[k]:bounds[k + 1]] for k in sorted(keep))
+
+
+def extract_hospital_name(texto):
+    if not texto:
+        return ""
+    best = None
+    # cada indicador se prueba aunque quede dentro del nombre de otro de menor prioridad
+    # ("la clínica San Martín y el Hospital Italiano" -> "Hospital Italiano")
+    for m in _located(texto, _HOSPITAL_LOC, _HOSPITAL_RE, overlapping=True):
+        prio = _indicator_priority(m.group(0))
+        if best is None or prio < best[0]:
+            best = (prio, m.group(0))
+            if prio == 0:
+                break
+    if best:
+        return " ".join(best[1].split())
+    # intento extra: nombres comunes "San Martín", "Santo Tomás" si aparecen con Hospital en snippet missing
+    for m2 in _HOSPITAL_SUFFIX_RE.finditer(texto):
+        start = max(0, m2.start() - 81)
+        prefix = _HOSPITAL_PREFIX_RE.search(texto, start, m2.start())
+        if prefix:
+            return texto[prefix.start():m2.end()].strip()
+    return ""
+
+
+def extract_modelo_heuristic(texto, marca):
+    if not texto:
+        return ""
+    modelo = ""
+    if marca:
+        m = next(_located(texto, *_brand_pattern(marca)), None)
+        if m:
+            modelo = (m.group(1) + " " + m.group(2)).strip()
+    if not modelo:
+        m2 = _MODELO_VERSION_RE.search(texto)
+        if m2:
+            modelo = m2.group(0).strip()
+    if not modelo:
+        m3 = next(_located(texto, _MODELO_EQUIPO_LOC, _MODELO_EQUIPO_RE), None)
+        if m3:
+            modelo = m3.group(1).strip()
+    return modelo
+
+
+# ------------- FECHA / CONFIANZA -------------
+_ISO_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_DAYFIRST_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y")
+
+
+def parse_fecha(valor, dayfirst=False):
+    """
+    Parser de una fecha suelta: primero formatos fijos (ISO y dd/mm/aaaa), que cubren
+    casi todo lo que extraemos; pd.to_datetime sólo si ninguno aplica. None si no es fecha.
+    """
+    valor = (valor or "").strip()
+    if not valor:
+        return None
+    m = _ISO_DATE_RE.fullmatch(valor)
+    if m:
+        try:
+            return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None
+    if dayfirst:
+        for fmt in _DAYFIRST_FORMATS:
+            try:
+                return datetime.strptime(valor, fmt)
+            except ValueError:
+                pass
+    parsed = pd.to_datetime(valor, dayfirst=dayfirst, errors="coerce")
+    return None if pd.isna(parsed) else parsed.to_pydatetime()
+
+
+def _normalize_fecha(valor):
+    m = _ISO_DATE_RE.search(valor)
+    if m:
+        return m.group(0)
+    parsed = parse_fecha(valor, dayfirst=True)
+    if parsed:
+        return parsed.strftime("%Y-%m-%d")
+    return None
+
+
+def extract_fecha(page):
+    """
+    Fecha de publicación: la de los datos estructurados (JSON-LD, feed, API) si la hay;
+    si no, la del primer <time> o de las metas article:published_time / pubdate.
+    """
+    if not page:
+        return None
+    if page.published:
+        fecha = _normalize_fecha(page.published)
+        if fecha:
+            return fecha
+    if page.time_value:
+        try:
+            fecha = _normalize_fecha(page.time_value)
+            if fecha:
+                return fecha
+        except:
+            return page.time_value.strip()
+    if page.meta_date:
+        try:
+            return _normalize_fecha(page.meta_date)
+        except:
+            return page.meta_date
+    return None
+
+
+def compute_confidence(row):
+    score = 0
+    if row.get("Ubicación (Hospital)"):
+        score += 35
+    if row.get("Marca"):
+        score += 25
+    if row.get("Modelo"):
+        score += 20
+    fecha = row.get("Fecha instalación", "")
+    if fecha and isinstance(fecha, str) and not (fecha.startswith("*") and fecha.endswith("*")):
+        score += 20
+    return min(100, score)
+
+
+def _filled(col):
+    return col.fillna("").astype(str).str.len() > 0
+
+
+def is_placeholder_fecha(fechas):
+    """Máscara de las fechas en cursiva (*aaaa-mm-dd*): la fecha del día usada cuando no se encontró otra."""
+    fechas = fechas.fillna("").astype(str)
+    return fechas.str.startswith("*") & fechas.str.endswith("*")
+
+
+def confidence_scores(df):
+    """compute_confidence sobre todas las filas a la vez (columnas, no fila por fila)."""
+    fechas = df["Fecha instalación"].fillna("").astype(str)
+    score = (
+        35 * _filled(df["Ubicación (Hospital)"])
+        + 25 * _filled(df["Marca"])
+        + 20 * _filled(df["Modelo"])
+        + 20 * ((fechas.str.len() > 0) & ~is_placeholder_fecha(fechas))
+    )
+    return score.clip(upper=100).astype(int)
+
+
+def fecha_sort_key(fechas):
+    """Fechas como datetime para ordenar (NaT para las de cursiva o no parseables)."""
+    fechas = fechas.fillna("").astype(str).where(lambda f: ~is_placeholder_fecha(f), "")
+    parsed = pd.to_datetime(fechas, format="%Y-%m-%d", errors="coerce")
+    # lo que no está en ISO (pocas filas) pasa por el parser general
+    rest = parsed.isna() & (fechas != "")
+    if rest.any():
+        parsed[rest] = pd.to_datetime(fechas[rest], format="mixed", errors="coerce")
+    return parsed
+
+
+def is_quality(art):
+    # criterio de calidad: hospital + equipo
+    return bool(art and art.get("Ubicación (Hospital)") and art.get("Tipo"))
+
+
+# ------------- EXTRACCIÓN DE UN ARTÍCULO (CPU, sin red) -------------
+# columnas de cada fila de resultados, en el orden de la tabla / CSV
+RESULT_COLUMNS = [
+    "Tipo", "Modelo", "Modalidad", "Fecha instalación", "Ubicación (Hospital)",
+    "Marca", "Fuente", "Título", "Link", "Confianza",
+]
+# columnas internas: viajan con la fila (sinks, store) para agrupar duplicados, pero no se muestran ni exportan
+INTERNAL_COLUMNS = ["Huella"]
+
+
+class _Laps:
+    """Suma a 'timings' (dict etapa -> segundos) el tiempo desde la marca anterior; no hace nada sin dict."""
+
+    def __init__(self, timings):
+        self.timings = timings
+        self.last = time.perf_counter() if timings is not None else 0
+
+    def __call__(self, stage):
+        if self.timings is not None:
+            now = time.perf_counter()
+            self.timings[stage] = self.timings.get(stage, 0.0) + now - self.last
+            self.last = now
+
+
+def extract_article(html, link, source_label, snippet_text=None, matcher=None, known_hash=None, timings=None,
+                    page=None):
+    """
+    Extrae la fila de un artículo a partir del HTML ya descargado (None si la descarga
+    falló: se usa 'snippet_text'). Devuelve (fila, hash del texto); si el hash coincide
+    con 'known_hash' (contenido sin cambios) devuelve (None, hash) sin extraer.
+    No toca la red, así que puede correr en otro proceso. Si se pasa el dict 'timings',
+    suma ahí los segundos de cada paso (parse, scan, fecha, modelo, hospital, huella).
+    'page' es un ParsedPage ya armado (ítem de feed / API, ver sources.py) que
+    reemplaza al parseo del HTML.
+    """
+    lap = _Laps(timings)
+    result = {
+        "Tipo": "",
+        "Modelo": "",
+        "Modalidad": "",
+        "Fecha instalación": "",
+        "Ubicación (Hospital)": "",
+        "Marca": "",
+        "Fuente": source_label,
+        "Título": "",
+        "Link": link,
+        "Confianza": 0
+    }
+
+    page_text = ""
+    title = ""
+
+    try:
+        if page is None:
+            if html is None:
+                raise ValueError("sin HTML")
+            # sólo título, metas, <time>, párrafos y JSON-LD (parser rápido si está disponible)
+            page = parse_article(html)
+        title = page.title
+        page_text = title + " " + page.text
+    except Exception:
+        # no pudo descargar, usaremos snippet si existe
+        page_text = snippet_text or ""
+        title = "" if not title else title
+
+    # si la página devolvió muy poco texto pero tenemos snippet, usar snippet
+    if (not page_text or len(page_text) < 80) and snippet_text:
+        page_text = (snippet_text or "") + " " + page_text
+
+    lap("parse")
+    chash = content_hash(page_text)
+    if known_hash is not None and chash == known_hash:
+        return None, chash
+
+    # tipo, marca y modalidad en una sola pasada sobre el texto
+    hits, spans = matcher.scan(page_text)
+    # hospital y modelo se buscan primero en las oraciones alrededor de los términos encontrados
+    window = sentence_windows(page_text, spans)
+    lap("scan")
+
+    # detectar tipo (por snippet o page_text)
+    tipo_detectado = hits["tipo"]
+    if not tipo_detectado:
+        tipo_detectado = matcher.match(title)["tipo"]
+    if tipo_detectado:
+        result["Tipo"] = tipo_detectado
+
+    # fecha: preferir la de la página (<time> / metas) si se pudo parsear
+    fecha_pub = extract_fecha(page)
+    if fecha_pub:
+        try:
+            fecha_dt = parse_fecha(fecha_pub)
+            if fecha_dt:
+                result["Fecha instalación"] = fecha_dt.strftime("%Y-%m-%d")
+            else:
+                result["Fecha instalación"] = fecha_pub
+        except:
+            result["Fecha instalación"] = fecha_pub
+    else:
+        # intentar extraer fecha desde snippet (patrón dd/mm/yyyy o yyyy-mm-dd)
+        if snippet_text:
+            m = re.search(r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})', snippet_text)
+            if m:
+                try:
+                    parsed = parse_fecha(m.group(1), dayfirst=True)
+                    if parsed:
+                        result["Fecha instalación"] = parsed.strftime("%Y-%m-%d")
+                    else:
+                        result["Fecha instalación"] = m.group(1)
+                except:
+                    result["Fecha instalación"] = m.group(1)
+            else:
+                result["Fecha instalación"] = f"*{datetime.today().strftime('%Y-%m-%d')}*"
+        else:
+            result["Fecha instalación"] = f"*{datetime.today().strftime('%Y-%m-%d')}*"
+
+    lap("fecha")
+
+    # marca (por coincidencia en texto)
+    marca = hits["marca"]
+    result["Marca"] = marca
+
+    # modelo heurístico
+    modelo = extract_modelo_heuristic(window or page_text, marca)
+    result["Modelo"] = modelo
+    lap("modelo")
+
+    # hospital (preferir snippet)
+    ubic = extract_hospital_name(window) or extract_hospital_name(page_text)
+    result["Ubicación (Hospital)"] = ubic
+    lap("hospital")
+
+    # modalidad
+    result["Modalidad"] = hits["modalidad"]
+
+    result["Título"] = title or (snippet_text[:120] if snippet_text else "")
+    result["Link"] = link
+    result["Confianza"] = compute_confidence(result)
+    # huella del texto para agrupar artículos casi iguales (ver dedupe.py); no se exporta
+    result["Huella"] = format(simhash(page_text), "016x")
+    lap("huella")
+
+    return result, chash
@@ -0,0 +1,353 @@
+# fetcher.py - descarga concurrente con límites y cortesía por host
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # brotli es opcional: si está instalado urllib3 decodifica 'br'
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# 429 no se reintenta acá: lo maneja el HostLimiter adaptativo (ver Fetcher._get)
+RETRY_STATUS = (500, 502, 503, 504)
+
+
+def host_of(url):
+    return (urlparse(url).netloc or "").lower()
+
+
+def build_session(headers=None, pool_size=10, retries=2, backoff=0.5):
+    """
+    Session con pool de conexiones por host (keep-alive), compresión y
+    reintentos con backoff ante 5xx.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        # Retry-After lo aplica el HostLimiter: urllib3 reintentaría los 429 durmiendo dentro del pedido
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    session.headers.update(headers or {})
+    return session
+
+
+class BlockedError(requests.RequestException):
+    """El host respondió con un bloqueo (429 / captcha) o su circuito está abierto."""
+
+    def __init__(self, message, host=None, retry_after=None):
+        super().__init__(message)
+        self.host = host
+        self.retry_after = retry_after
+
+
+# páginas de "tráfico inusual" (Google responde /sorry/ con 429 o 503)
+BLOCK_MARKERS = (b"unusual traffic", b"trafico inusual", b"tr\xc3\xa1fico inusual")
+# formularios de captcha: en una página 200 pueden ser un simple formulario de contacto
+CAPTCHA_MARKERS = (b"g-recaptcha", b"captcha-form", b"cf-challenge")
+# buscadores: sólo en ellos una página 200 con BLOCK_MARKERS es un bloqueo (en una nota es texto)
+SEARCH_DOMAINS = ("google.com", "google.com.ar", "bing.com", "duckduckgo.com")
+
+# tipos de bloqueo (ver block_kind)
+THROTTLED = "throttled"  # 429 sin captcha: lo absorbe el HostLimiter
+CAPTCHA = "captcha"      # captcha / página /sorry/: abre el circuito enseguida
+
+
+def _retry_after(resp):
+    try:
+        return float(resp.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None  # ausente o con formato fecha
+
+
+def _is_search_host(host):
+    host = host.split(":")[0]
+    return any(host == d or host.endswith("." + d) for d in SEARCH_DOMAINS)
+
+
+def block_kind(resp):
+    """
+    CAPTCHA si la respuesta es una página de captcha / tráfico inusual o una redirección
+    a /sorry/, THROTTLED si es un 429 sin captcha, None si no es un bloqueo.
+    """
+    url = getattr(resp, "url", "") or ""
+    if "/sorry/" in url:
+        return CAPTCHA
+    status = resp.status_code
+    if status in (429, 403, 503) or (status == 200 and _is_search_host(host_of(url))):
+        head = (resp.content or b"")[:8192].lower()
+        markers = BLOCK_MARKERS if status == 200 else BLOCK_MARKERS + CAPTCHA_MARKERS
+        if any(m in head for m in markers):
+            return CAPTCHA
+    return THROTTLED if status == 429 else None
+
+
+class HostLimiter:
+    """
+    Limita la concurrencia por dominio y reparte los pedidos a cada host con un
+    token bucket (uno cada 'delay' segundos, ráfagas de hasta 'burst'). Ante un
+    bloqueo el intervalo se duplica (o sube a Retry-After) y con cada respuesta
+    normal vuelve de a poco al valor base.
+    """
+
+    def __init__(self, max_per_host=2, delay=0.25, overrides=None, burst=1, max_delay=60.0, recovery=0.9):
+        self.max_per_host = max_per_host
+        self.delay = delay
+        self.overrides = dict(overrides or {})  # host -> delay propio
+        self.burst = burst
+        self.max_delay = max_delay
+        self.recovery = recovery
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._buckets = {}  # host -> [tokens, última recarga, intervalo actual]
+
+    def _semaphore(self, host):
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = sem
+            return sem
+
+    def _bucket(self, host):
+        # llamar con self._lock tomado
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = [self.burst, time.monotonic(), self.overrides.get(host, self.delay)]
+            self._buckets[host] = bucket
+        return bucket
+
+    def _wait_turn(self, host):
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                tokens, last, interval = bucket
+                if interval <= 0:
+                    return
+                now = time.monotonic()
+                tokens = min(self.burst, tokens + (now - last) / interval)
+                if tokens >= 1:
+                    bucket[0], bucket[1] = tokens - 1, now
+                    return
+                bucket[0], bucket[1] = tokens, now
+                wait = (1 - tokens) * interval
+            time.sleep(wait)
+
+    def acquire(self, url):
+        host = host_of(url)
+        self._semaphore(host).acquire()
+        self._wait_turn(host)
+        return host
+
+    def release(self, host):
+        self._semaphore(host).release()
+
+    def backoff(self, host, retry_after=None):
+        """Bloqueo detectado: duplica el intervalo del host (al menos Retry-After) y vacía el bucket."""
+        with self._lock:
+            bucket = self._bucket(host)
+            base = self.overrides.get(host, self.delay) or 0.5
+            bucket[2] = min(self.max_delay, max(bucket[2] * 2, base, retry_after or 0))
+            bucket[0] = 0
+
+    def recover(self, host):
+        """Respuesta normal: el intervalo vuelve gradualmente al valor base."""
+        with self._lock:
+            bucket = self._bucket(host)
+            base = self.overrides.get(host, self.delay)
+            if bucket[2] > base:
+                bucket[2] = max(base, bucket[2] * self.recovery)
+
+    def current_delay(self, host):
+        with self._lock:
+            return self._bucket(host)[2]
+
+
+class CircuitBreaker:
+    """
+    Corta los pedidos a un host bloqueado durante 'cooldown' segundos (o lo que pida
+    Retry-After, si es más): seguir pidiendo sólo alarga el bloqueo. Se abre con un
+    captcha o con 'threshold' bloqueos seguidos; los 429 sueltos los absorbe el HostLimiter.
+    """
+
+    def __init__(self, cooldown=600, threshold=3):
+        self.cooldown = cooldown
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._open_until = {}
+        self._trips = {}
+        self._strikes = {}  # host -> bloqueos seguidos
+
+    def allow(self, host):
+        with self._lock:
+            return self._open_until.get(host, 0) <= time.time()
+
+    def blocked(self, host, retry_after=None, hard=False):
+        """Registra un bloqueo; abre el circuito si es 'hard' o el 'threshold'-ésimo seguido. True si quedó abierto."""
+        with self._lock:
+            strikes = self._strikes.get(host, 0) + 1
+            self._strikes[host] = strikes
+        if hard or strikes >= self.threshold:
+            self.trip(host, retry_after)
+            return True
+        return not self.allow(host)
+
+    def success(self, host):
+        with self._lock:
+            self._strikes.pop(host, None)
+
+    def trip(self, host, retry_after=None):
+        with self._lock:
+            self._open_until[host] = time.time() + max(self.cooldown, retry_after or 0)
+            self._trips[host] = self._trips.get(host, 0) + 1
+            self._strikes.pop(host, None)
+
+    def trips(self):
+        """{host: veces que se abrió el circuito}."""
+        with self._lock:
+            return dict(self._trips)
+
+    def open_hosts(self):
+        now = time.time()
+        with self._lock:
+            return sorted(h for h, until in self._open_until.items() if until > now)
+
+
+class Fetcher:
+    """Descarga URLs respetando el HostLimiter y permite procesar lotes en paralelo."""
+
+    def __init__(self, headers=None, timeout=12, max_workers=16, max_per_host=2, host_delay=0.25, host_overrides=None,
+                 retries=2, backoff=0.5, cache=None, block_retries=2):
+        self.headers = headers or {}
+        self.cache = cache  # HttpCache opcional
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.limiter = HostLimiter(max_per_host, host_delay, host_overrides)
+        self.breaker = CircuitBreaker()
+        self.block_retries = block_retries  # reintentos ante un 429 sin captcha
+        self._waits = threading.local()  # espera de turno del get() en curso, por thread
+        # el pool por host alcanza para todos los threads que puedan apuntarle
+        self.session = build_session(self.headers, pool_size=max(max_per_host, 10), retries=retries, backoff=backoff)
+
+    def _get(self, url, max_bytes=None, **kwargs):
+        """
+        GET respetando el limitador y el circuito del host. Un 429 sin captcha frena el
+        host (backoff) y se reintenta hasta 'block_retries' veces; un captcha, un
+        Retry-After mayor que el intervalo máximo o varios bloqueos seguidos abren el
+        circuito y levantan BlockedError.
+        """
+        host = host_of(url)
+        kwargs.setdefault("timeout", self.timeout)
+        for _ in range(self.block_retries + 1):
+            resp = self._request(url, host, max_bytes, kwargs)
+            kind = block_kind(resp)
+            if kind is None:
+                self.limiter.recover(host)
+                self.breaker.success(host)
+                return resp
+            # se levanta antes de llegar a la caché: un captcha no se guarda como respuesta válida
+            retry_after = _retry_after(resp)
+            self.limiter.backoff(host, retry_after)
+            hard = kind == CAPTCHA or (retry_after or 0) > self.limiter.max_delay
+            if self.breaker.blocked(host, retry_after, hard=hard):
+                break
+        raise BlockedError(f"{host} bloqueado (HTTP {resp.status_code})", host=host, retry_after=retry_after)
+
+    def _request(self, url, host, max_bytes, kwargs):
+        if not self.breaker.allow(host):
+            raise BlockedError(f"{host} bloqueado: circuito abierto", host=host)
+        start = time.perf_counter()
+        self.limiter.acquire(url)
+        self._waits.seconds = getattr(self._waits, "seconds", 0.0) + time.perf_counter() - start
+        try:
+            if not self.breaker.allow(host):
+                # se abrió mientras esperaba turno: no sumar otro pedido bloqueado (ni otro backoff)
+                raise BlockedError(f"{host} bloqueado: circuito abierto", host=host)
+            kwargs = dict(kwargs)
+            timeout = kwargs.pop("timeout")
+            if not max_bytes:
+                resp = self.session.get(url, timeout=timeout, **kwargs)
+            else:
+                # descarga en streaming y corta en max_bytes (portales de varios MB)
+                resp = self.session.get(url, timeout=timeout, stream=True, **kwargs)
+                try:
+                    body = bytearray()
+                    for chunk in resp.iter_content(64 * 1024):
+                        body += chunk
+                        if len(body) >= max_bytes:
+                            break
+                    resp._content = bytes(body[:max_bytes])
+                finally:
+                    resp.close()
+        finally:
+            self.limiter.release(host)
+        return resp
+
+    def get(self, url, kind=None, **kwargs):
+        """
+        GET con límites por host. Si hay caché y se indica 'kind' (article, listing,
+        google) la respuesta sale de la caché o se revalida; los hits no tocan la red.
+        Con max_bytes el cuerpo se descarga en streaming y se trunca en ese tamaño.
+        """
+        self._waits.seconds = 0.0
+        if self.cache is None or kind is None:
+            return self._get(url, **kwargs)
+        return self.cache.fetch(url, kind, lambda extra: self._get(url, headers=extra, **kwargs))
+
+    def last_wait(self):
+        """Segundos que el último get() de este thread esperó su turno en el HostLimiter (cortesía, no red)."""
+        return getattr(self._waits, "seconds", 0.0)
+
+    def block_report(self):
+        """{host: {"trips", "open", "delay"}} de los hosts que bloquearon alguna vez."""
+        open_hosts = set(self.breaker.open_hosts())
+        return {host: {"trips": n, "open": host in open_hosts, "delay": round(self.limiter.current_delay(host), 2)}
+                for host, n in self.breaker.trips().items()}
+
+    def map(self, fn, items):
+        """
+        Ejecuta fn(item) en un pool de threads. Genera (item, resultado, error)
+        a medida que terminan; el límite por host lo aplica get().
+        """
+        items = list(items)
+        if not items:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            futures = {pool.submit(fn, it): it for it in items}
+            for fut in as_completed(futures):
+                it = futures[fut]
+                try:
+                    yield it, fut.result(), None
+                except Exception as e:
+                    yield it, None, e
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_fetcher(headers=None, **kwargs):
+    """Fetcher reutilizable entre llamadas (y reruns de Streamlit) para no perder las conexiones abiertas."""
+    key = (tuple(sorted((headers or {}).items())), tuple(sorted(kwargs.items())))
+    with _shared_lock:
+        f = _shared.get(key)
+        if f is None:
+            f = Fetcher(headers=headers, **kwargs)
+            _shared[key] = f
+        return f
@@ -0,0 +1,201 @@
+# frontier.py - descubrimiento de enlaces en sitios institucionales ordenado por relevancia
+# (rutas de noticias, texto del enlace, sitemap.xml, feeds RSS/Atom y paginación)
+import heapq
+import json
+import re
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from parsing import BS_FEATURES
+from screening import is_irrelevant
+from sources import api_entries, feed_entries
+
+# tope de bytes de sitemaps / feeds (algunos sitemaps pesan decenas de MB)
+DISCOVERY_MAX_BYTES = 2 * 1024 * 1024
+# páginas de listado (la inicial más las siguientes de la paginación) por sitio
+MAX_LISTING_PAGES = 3
+# sitemaps hijos a revisar cuando sitemap.xml es un índice
+MAX_CHILD_SITEMAPS = 3
+
+_NEWS_PATH_RE = re.compile(
+    r"/(news|noticias?|prensa|press|press-releases?|newsroom|novedades|comunicados?|blog|"
+    r"articulos?|articles?|actualidad|eventos?|casos?-de-exito|case-stud(?:y|ies)|historias?|stories)(?:[/.?#-]|$)",
+    re.IGNORECASE,
+)
+_DATE_PATH_RE = re.compile(r"/20\d\d(?:[/-](?:0?[1-9]|1[0-2]))?(?:[/-]|$)")
+_SLUG_RE = re.compile(r"/[a-z0-9]+(?:-[a-z0-9]+){3,}(?:\.html?)?/?$", re.IGNORECASE)
+_PAGINATION_TEXT = {"siguiente", "siguientes", "next", "›", "»", "más noticias", "ver más noticias", "older posts", "anteriores"}
+_PAGINATION_HREF_RE = re.compile(r"(?:[?&](?:page|pagina|p)=\d+|/page/\d+/?$|/pagina/\d+/?$)", re.IGNORECASE)
+_FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+_LOC_RE = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+
+
+def score_link(url, anchor_text, matcher):
+    """
+    Relevancia de un enlace candidato: ruta de noticias / con fecha / slug de nota,
+    y términos de equipos, marcas, modalidades u hospitales en el texto del enlace.
+    0 o menos = no parece una nota.
+    """
+    path = urlparse(url).path
+    score = 0
+    if _NEWS_PATH_RE.search(path):
+        score += 3
+    if _DATE_PATH_RE.search(path):
+        score += 2
+    if _SLUG_RE.search(path):
+        score += 1
+    text = (anchor_text or "").strip()
+    if text:
+        hits = matcher.match(text)
+        score += 4 * bool(hits["tipo"]) + 2 * bool(hits["marca"]) + 2 * bool(hits["modalidad"])
+        if len(text.split()) >= 5:
+            score += 1  # titular, no ítem de menú
+    return score
+
+
+def _get_ok(fetcher, url):
+    try:
+        resp = fetcher.get(url, kind="listing", max_bytes=DISCOVERY_MAX_BYTES)
+    except Exception:
+        return None
+    return resp if resp.ok else None
+
+
+def source_entries(fetcher, source):
+    """
+    Notas del feed y / o la API JSON declarados en la fuente (ver sources.py), como
+    Entry; [] si no declara ninguno o si fallan (entonces se usa el listado HTML).
+    """
+    entries = []
+    if source.feed:
+        resp = _get_ok(fetcher, source.feed)
+        if resp is not None:
+            entries += feed_entries(resp.content, source.feed)
+    if source.api:
+        resp = _get_ok(fetcher, source.api)
+        if resp is not None:
+            # json.loads(text) y no resp.json(): de la caché vuelve un CachedResponse
+            try:
+                entries += api_entries(json.loads(resp.text), source.fields, source.api)
+            except (ValueError, AttributeError, TypeError):
+                pass
+    return entries
+
+
+def _sitemap_urls(fetcher, root):
+    """URLs de sitemap.xml (y de algunos sitemaps hijos si es un índice), sólo las de rutas de noticias."""
+    resp = _get_ok(fetcher, urljoin(root, "/sitemap.xml"))
+    if resp is None:
+        return []
+    text = resp.text
+    if "<sitemapindex" in text:
+        children = _LOC_RE.findall(text)
+        # preferir los sitemaps de noticias / posts
+        children.sort(key=lambda u: not re.search(r"news|noticia|post|prensa|blog", u, re.IGNORECASE))
+        urls = []
+        for child in children[:MAX_CHILD_SITEMAPS]:
+            child_resp = _get_ok(fetcher, child)
+            if child_resp is not None:
+                urls += _LOC_RE.findall(child_resp.text)
+    else:
+        urls = _LOC_RE.findall(text)
+    return [u for u in urls if _NEWS_PATH_RE.search(urlparse(u).path)]
+
+
+class Frontier:
+    """Cola de prioridad de enlaces candidatos (mayor puntaje primero, luego orden de descubrimiento)."""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self._heap = []
+        self._queued = set()
+        self._count = 0
+
+    def push(self, url, anchor_text="", bonus=0):
+        if not url or url in self._queued or is_irrelevant(url, anchor_text):
+            return
+        self._queued.add(url)
+        score = score_link(url, anchor_text, self.matcher) + bonus
+        heapq.heappush(self._heap, (-score, self._count, url, anchor_text))
+        self._count += 1
+
+    def promising(self):
+        return sum(1 for s, *_ in self._heap if s < 0)
+
+    def ranked(self):
+        """[(url, texto, puntaje)] de mayor a menor puntaje."""
+        return [(url, text, -s) for s, _, url, text in sorted(self._heap)]
+
+
+def _listing_anchors(page_url, html):
+    """(enlaces con texto, URL de la página siguiente o None) de una página de listado."""
+    soup = BeautifulSoup(html, BS_FEATURES)
+    links = []
+    next_url = None
+    host = urlparse(page_url).hostname
+    nxt = soup.find(["a", "link"], rel="next", href=True)
+    if nxt is not None:
+        next_url = urljoin(page_url, nxt["href"])
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if href.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        full = urljoin(page_url, href)
+        txt = a.get_text(strip=True)
+        if txt.lower() in _PAGINATION_TEXT or (_PAGINATION_HREF_RE.search(href) and txt.isdigit()):
+            # paginación: se sigue como listado, no es una nota
+            if next_url is None and urlparse(full).hostname == host and txt != "1":
+                next_url = full
+            continue
+        if txt:
+            links.append((full, txt))
+    feeds = [urljoin(page_url, l["href"]) for l in soup.find_all("link", href=True)
+             if (l.get("type") or "").lower() in _FEED_TYPES]
+    return links, next_url, feeds
+
+
+def rank_entries(entries, matcher):
+    """[(url, título, puntaje)] de los ítems de un feed / API, ordenado por relevancia."""
+    frontier = Frontier(matcher)
+    for entry in entries:
+        frontier.push(entry.link, entry.title, bonus=2)  # ítems de feed: siempre son notas
+    return frontier.ranked()
+
+
+def discover_links(fetcher, url, html, matcher, budget, use_sitemap=True, entries=None):
+    """
+    Arma la frontera de un sitio a partir del HTML de su listado: enlaces del listado,
+    ítems de los feeds RSS/Atom declarados, URLs de noticias de sitemap.xml y páginas
+    siguientes de la paginación (hasta MAX_LISTING_PAGES o hasta juntar 'budget'
+    candidatos prometedores). Devuelve [(url, texto, puntaje)] ordenado por relevancia.
+    Si se pasa el dict 'entries', guarda ahí url -> Entry de los ítems de feeds.
+    """
+    frontier = Frontier(matcher)
+    links, next_url, feeds = _listing_anchors(url, html)
+    for link, txt in links:
+        frontier.push(link, txt)
+    if use_sitemap:
+        for feed in feeds:
+            resp = _get_ok(fetcher, feed)
+            if resp is not None:
+                for entry in feed_entries(resp.content, feed):
+                    frontier.push(entry.link, entry.title, bonus=2)  # ítems de feed: siempre son notas
+                    if entries is not None:
+                        entries.setdefault(entry.link, entry)
+        parsed = urlparse(url)
+        for link in _sitemap_urls(fetcher, f"{parsed.scheme}://{parsed.netloc}/"):
+            frontier.push(link)
+    pages = 1
+    visited = {url}
+    while next_url and next_url not in visited and pages < MAX_LISTING_PAGES and frontier.promising() < budget:
+        visited.add(next_url)
+        resp = _get_ok(fetcher, next_url)
+        if resp is None:
+            break
+        pages += 1
+        links, page_next, _ = _listing_anchors(next_url, resp.text)
+        for link, txt in links:
+            frontier.push(link, txt)
+        next_url = page_next
+    return frontier.ranked()
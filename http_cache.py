@@ -0,0 +1,170 @@
+# http_cache.py - caché HTTP persistente (SQLite) con revalidación condicional
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# segundos de validez por tipo de fuente; vencido el TTL se revalida con ETag / Last-Modified
+DEFAULT_TTLS = {
+    "article": 7 * 24 * 3600,  # las noticias casi nunca cambian
+    "listing": 6 * 3600,       # portadas / listados institucionales
+    "google": 12 * 3600,       # páginas de resultados de Google
+}
+DEFAULT_PATH = os.path.join(".cache", "http_cache.sqlite")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "trk", "trackingId")
+
+
+def normalize_url(url):
+    """Clave de caché: esquema/host en minúscula, sin fragmento, sin parámetros de tracking y query ordenada."""
+    p = urlparse(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(p.query, keep_blank_values=True) if not k.startswith(_TRACKING_PARAMS))
+    path = p.path or "/"
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), path, p.params, urlencode(query), ""))
+
+
+class CachedResponse:
+    """Respuesta mínima compatible con lo que usa el scraper de requests.Response."""
+
+    def __init__(self, url, status_code, headers, content, encoding="utf-8", from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class HttpCache:
+    """
+    Caché de respuestas por URL normalizada. Dentro del TTL se sirve sin red;
+    vencido, se hace un GET condicional y un 304 sólo renueva la entrada.
+    Si el tamaño total supera max_bytes se desalojan las menos usadas.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttls=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._write_lock:
+            self._conn().execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    status INTEGER,
+                    headers TEXT,
+                    body BLOB,
+                    encoding TEXT,
+                    size INTEGER,
+                    fetched_at REAL,
+                    last_access REAL
+                )"""
+            )
+            self._conn().commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _load(self, key):
+        return self._conn().execute(
+            "SELECT status, headers, body, encoding, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _store(self, key, resp):
+        body = zlib.compress(resp.content)
+        headers = {k.lower(): v for k, v in resp.headers.items() if k.lower() in ("etag", "last-modified", "content-type")}
+        now = time.time()
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, resp.status_code, json.dumps(headers), body, resp.encoding or "utf-8", len(body), now, now),
+            )
+            conn.commit()
+        self._evict()
+
+    def _touch(self, key, revalidated=False):
+        now = time.time()
+        with self._write_lock:
+            conn = self._conn()
+            if revalidated:
+                conn.execute("UPDATE responses SET fetched_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+            else:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+
+    def _evict(self):
+        with self._write_lock:
+            conn = self._conn()
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            excess = total - self.max_bytes
+            rows = conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+            drop = []
+            for key, size in rows:
+                if excess <= 0:
+                    break
+                drop.append((key,))
+                excess -= size
+            conn.executemany("DELETE FROM responses WHERE key = ?", drop)
+            conn.commit()
+
+    def fetch(self, url, kind, do_get):
+        """
+        Devuelve la respuesta de 'url' usando la caché. do_get(extra_headers) hace
+        el GET real (con los headers condicionales que correspondan).
+        """
+        key = normalize_url(url)
+        row = self._load(key)
+        ttl = self.ttls.get(kind, 0)
+        if row:
+            status, headers_json, body, encoding, fetched_at = row
+            headers = json.loads(headers_json)
+            cached = CachedResponse(url, status, headers, zlib.decompress(body), encoding, from_cache=True)
+            if time.time() - fetched_at < ttl:
+                self._touch(key)
+                return cached
+            conditional = {}
+            if headers.get("etag"):
+                conditional["If-None-Match"] = headers["etag"]
+            if headers.get("last-modified"):
+                conditional["If-Modified-Since"] = headers["last-modified"]
+            resp = do_get(conditional)
+            if resp.status_code == 304:
+                self._touch(key, revalidated=True)
+                return cached
+        else:
+            resp = do_get({})
+        if resp.status_code == 200:
+            self._store(key, resp)
+        return resp
+
+    def clear(self):
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
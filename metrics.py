@@ -0,0 +1,159 @@
+# metrics.py - tiempos por etapa, bytes, caché, errores por host y filas por fuente de una corrida
+import threading
+import time
+from collections import defaultdict
+
+from fetcher import host_of
+
+# límites superiores (ms) de los buckets del histograma de latencias
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # el último es "más de 30 s"
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        i = 0
+        while i < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def _quantile_ms(self, q):
+        # cota superior del bucket donde cae el cuantil
+        target = q * self.count
+        acc = 0
+        for i, n in enumerate(self.counts):
+            acc += n
+            if acc >= target and n:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else round(self.max * 1000)
+        return 0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 2) if self.count else 0,
+            "p50_ms": self._quantile_ms(0.5),
+            "p95_ms": self._quantile_ms(0.95),
+            "max_ms": round(self.max * 1000, 2),
+            "histogram_ms": {
+                (f"<={b}" if i < len(LATENCY_BUCKETS_MS) else f">{LATENCY_BUCKETS_MS[-1]}"): n
+                for i, (b, n) in enumerate(zip(LATENCY_BUCKETS_MS + (None,), self.counts)) if n
+            },
+        }
+
+
+class RunMetrics:
+    """
+    Acumula las mediciones de una corrida (thread-safe): latencias por etapa,
+    bytes descargados por host, aciertos de caché por tipo, errores por host y
+    clase, y filas por fuente. report() arma el reporte JSON.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._stages = defaultdict(_Histogram)
+        self._bytes = defaultdict(int)
+        self._cache = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._errors = defaultdict(lambda: defaultdict(int))
+        self._rows = defaultdict(int)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._stages[stage].observe(seconds)
+
+    def timed(self, stage):
+        """Context manager que mide el bloque en la etapa 'stage'."""
+        return _Timer(self, stage)
+
+    def add_bytes(self, host, n):
+        with self._lock:
+            self._bytes[host] += n
+
+    def cache(self, kind, hit):
+        with self._lock:
+            self._cache[kind]["hits" if hit else "misses"] += 1
+
+    def error(self, host, error_class):
+        with self._lock:
+            self._errors[host][error_class] += 1
+
+    def row(self, source):
+        with self._lock:
+            self._rows[source] += 1
+
+    def report(self, stats=None):
+        with self._lock:
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "duration_s": round(time.perf_counter() - self._t0, 3),
+                "stages": {name: h.summary() for name, h in sorted(self._stages.items())},
+                "bytes": {"total": sum(self._bytes.values()),
+                          "by_host": dict(sorted(self._bytes.items(), key=lambda kv: -kv[1]))},
+                "cache": {kind: dict(c) for kind, c in self._cache.items()},
+                "errors": {host: dict(c) for host, c in self._errors.items()},
+                "rows_by_source": dict(self._rows),
+                "stats": stats or {},
+            }
+
+
+class _Timer:
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self._start)
+        return False
+
+
+class MeteredFetcher:
+    """
+    Envuelve un Fetcher (compartido entre corridas) y registra en 'metrics' cada get():
+    la espera del turno del host en queue:<kind>, el resto (red, caché) en fetch:<kind>,
+    bytes, aciertos de caché y errores por host.
+    El resto de los atributos (map, breaker, max_workers...) son los del fetcher.
+    """
+
+    def __init__(self, fetcher, metrics):
+        self._fetcher = fetcher
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._fetcher, name)
+
+    def get(self, url, kind=None, **kwargs):
+        host = host_of(url)
+        start = time.perf_counter()
+        try:
+            resp = self._fetcher.get(url, kind=kind, **kwargs)
+        except Exception as e:
+            self.metrics.error(host, type(e).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            waited = self._fetcher.last_wait()
+            self.metrics.observe(f"queue:{kind or 'other'}", waited)
+            self.metrics.observe(f"fetch:{kind or 'other'}", elapsed - waited)
+        from_cache = getattr(resp, "from_cache", False)
+        if kind is not None and self._fetcher.cache is not None:
+            self.metrics.cache(kind, from_cache)
+        if not from_cache:
+            self.metrics.add_bytes(host, len(resp.content or b""))
+        if resp.status_code >= 400:
+            self.metrics.error(host, f"HTTP {resp.status_code}")
+        return resp
@@ -0,0 +1,155 @@
+# parsing.py - parseo parcial y rápido de artículos (selectolax / lxml si están instalados)
+import json
+from collections import namedtuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    BS_FEATURES = "lxml"  # también acelera los BeautifulSoup de Google / listados
+except ImportError:
+    lxml = None
+    BS_FEATURES = "html.parser"
+
+# tope de bytes a descargar por artículo: el texto útil suele estar en los primeros KB
+ARTICLE_MAX_BYTES = 1024 * 1024
+
+# sólo lo que usa la extracción: título, metas, <time>, párrafos y JSON-LD.
+# 'published' es la fecha de los datos estructurados (JSON-LD, feed, API): gana sobre <time> y metas
+ParsedPage = namedtuple("ParsedPage", ["title", "text", "time_value", "meta_date", "published"])
+_STRAINER = SoupStrainer(["title", "meta", "time", "p", "script"])
+_META_TITLE = (("property", "og:title"), ("name", "title"))
+_META_DATE = (("property", "article:published_time"), ("name", "pubdate"))
+_META_DESCRIPTION = (("property", "og:description"), ("name", "description"))
+_LD_JSON = "application/ld+json"
+# tipos schema.org que describen una nota
+_LD_ARTICLE_TYPES = {"NewsArticle", "Article", "BlogPosting", "ReportageNewsArticle", "AnalysisNewsArticle", "PressRelease"}
+
+
+def _first_meta(metas, wanted):
+    # metas: lista de dicts de atributos, en orden de documento
+    for attr, value in wanted:
+        for m in metas:
+            if m.get(attr) == value:
+                return m
+    return None
+
+
+def _ld_article(blocks):
+    """(titular, fecha, cuerpo, descripción) del primer NewsArticle / Article de los bloques JSON-LD, o None."""
+    for block in blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        pending = [data]
+        while pending:
+            node = pending.pop(0)
+            if isinstance(node, list):
+                pending.extend(node)
+                continue
+            if not isinstance(node, dict):
+                continue
+            types = node.get("@type")
+            types = set(types) if isinstance(types, list) else {types}
+            if types & _LD_ARTICLE_TYPES:
+                headline, body, description = (node.get(k) for k in ("headline", "articleBody", "description"))
+                return (headline if isinstance(headline, str) else "",
+                        node.get("datePublished") or node.get("dateCreated"),
+                        html_to_text(body) if isinstance(body, str) else "",
+                        html_to_text(description) if isinstance(description, str) else "")
+            pending.extend(node.get("@graph") or ())
+    return None
+
+
+def html_to_text(html):
+    """Texto plano de un fragmento HTML (cuerpos de feeds, APIs y JSON-LD)."""
+    if not html or "<" not in html:
+        return " ".join((html or "").split())
+    if LexborHTMLParser is not None:
+        body = LexborHTMLParser(html).body
+        return body.text(separator=" ", strip=True) if body is not None else ""
+    return BeautifulSoup(html, BS_FEATURES).get_text(" ", strip=True)
+
+
+def _parse_selectolax(html):
+    tree = LexborHTMLParser(html)
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node else ""
+    metas = [m.attributes for m in tree.css("meta")]
+    time_node = tree.css_first("time")
+    time_value = (time_node.attributes.get("datetime") or time_node.text(strip=True)) if time_node else None
+    text = " ".join(p.text(separator=" ", strip=True) for p in tree.css("p"))
+    ld = [s.text() for s in tree.css(f'script[type="{_LD_JSON}"]')]
+    return title, text, metas, time_value, ld
+
+
+def _parse_lxml(html):
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except ValueError:  # str con declaración de encoding
+        doc = lxml.html.document_fromstring(html.encode("utf-8"))
+    title_node = next(doc.iter("title"), None)
+    title = (title_node.text_content() or "").strip() if title_node is not None else ""
+    metas = [dict(m.attrib) for m in doc.iter("meta")]
+    time_node = next(doc.iter("time"), None)
+    time_value = None
+    if time_node is not None:
+        time_value = time_node.get("datetime") or (time_node.text_content() or "").strip()
+    text = " ".join(" ".join(t.strip() for t in p.itertext() if t.strip()) for p in doc.iter("p"))
+    ld = [s.text_content() for s in doc.iter("script") if (s.get("type") or "").lower() == _LD_JSON]
+    return title, text, metas, time_value, ld
+
+
+def _parse_bs4(html):
+    soup = BeautifulSoup(html, BS_FEATURES, parse_only=_STRAINER)
+    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+    metas = [m.attrs for m in soup.find_all("meta")]
+    time_tag = soup.find("time")
+    time_value = (time_tag.get("datetime") or time_tag.get_text(strip=True)) if time_tag else None
+    text = " ".join(p.get_text(separator=" ", strip=True) for p in soup.find_all("p"))
+    ld = [s.string or "" for s in soup.find_all("script", type=_LD_JSON)]
+    return title, text, metas, time_value, ld
+
+
+def parse_article(html):
+    """
+    Extrae título (<title>, og:title o meta title), texto de los <p>, el valor del
+    primer <time> y la fecha de publicación de las metas, sin armar un árbol
+    BeautifulSoup completo cuando hay un parser más rápido disponible.
+    Si la página publica un NewsArticle en JSON-LD, su titular, datePublished y
+    articleBody tienen prioridad; sin <p>, el texto es og:description / description.
+    """
+    if not html:
+        return ParsedPage("", "", None, None, None)
+    if LexborHTMLParser is not None:
+        title, text, metas, time_value, ld = _parse_selectolax(html)
+    elif lxml is not None:
+        title, text, metas, time_value, ld = _parse_lxml(html)
+    else:
+        title, text, metas, time_value, ld = _parse_bs4(html)
+    published = None
+    article = _ld_article(ld) if ld else None
+    if article:
+        headline, published, body, description = article
+        title = headline.strip() or title
+        # articleBody es la nota sin menú ni pie: reemplaza a los <p> salvo que venga recortado
+        if len(body) > len(text) // 2:
+            text = body
+        text = text or description
+    if not title:
+        meta_title = _first_meta(metas, _META_TITLE)
+        if meta_title and meta_title.get("content"):
+            title = meta_title.get("content").strip()
+    if not text:
+        description = _first_meta(metas, _META_DESCRIPTION)
+        if description and description.get("content"):
+            text = description.get("content").strip()
+    meta_date = _first_meta(metas, _META_DATE)
+    return ParsedPage(title, text, time_value, meta_date.get("content") if meta_date else None,
+                      published if isinstance(published, str) else None)
@@ -0,0 +1,112 @@
+# pipeline.py - descarga (threads) y extracción (procesos) desacopladas
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from extraction import extract_article, get_matcher, is_quality
+from parsing import ARTICLE_MAX_BYTES
+
+_worker_matcher = None
+
+
+def _init_worker(equipos, marcas, modalidades):
+    # cada proceso compila el matcher una sola vez
+    global _worker_matcher
+    _worker_matcher = get_matcher(equipos, marcas, modalidades)
+
+
+def _extract_in_worker(html, link, source_label, snippet_text, known_hash):
+    timings = {}
+    result, chash = extract_article(html, link, source_label, snippet_text, _worker_matcher, known_hash, timings)
+    return result, chash, timings
+
+
+def _mp_context():
+    # forkserver evita heredar los threads del proceso (Streamlit, pools HTTP)
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def fetch_html(fetcher, link):
+    """HTML del artículo (truncado a ARTICLE_MAX_BYTES) o None si la descarga falla."""
+    try:
+        return fetcher.get(link, kind="article", max_bytes=ARTICLE_MAX_BYTES).text
+    except Exception:
+        return None
+
+
+def remember(store, link, source_label, result, chash):
+    """Actualiza el store incremental con el resultado de un artículo."""
+    if result is None:
+        store.touch(link)  # contenido sin cambios
+    else:
+        store.record(link, source_label, chash, result if is_quality(result) else None)
+
+
+def process_jobs(jobs, fetcher, keywords, store=None, workers=None, metrics=None):
+    """
+    Procesa jobs (link, fuente, snippet): los threads del fetcher descargan y dejan
+    el HTML a un pool de procesos que parsea y extrae, así la extracción escala con
+    los cores mientras la red sigue ocupada. 'keywords' es (equipos, marcas, modalidad_dict).
+    Genera (job, fila o None, error) a medida que cada artículo termina.
+    Con workers=0 la extracción corre en los mismos threads de descarga.
+    Con 'metrics' (RunMetrics) registra el tiempo de cada paso de la extracción.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    done = queue.Queue()
+    matcher = get_matcher(*keywords)
+
+    def finish(job, extracted):
+        link, label, _ = job
+        result, chash, timings = extracted
+        if metrics is not None:
+            for step, seconds in timings.items():
+                metrics.observe(f"extract:{step}", seconds)
+        if store is not None:
+            remember(store, link, label, result, chash)
+        return result
+
+    def known_hash(link):
+        return store.get_hash(link) if store is not None else None
+
+    if workers <= 0:
+        def run_inline(job):
+            link, label, snippet = job
+            html = fetch_html(fetcher, link)
+            timings = {}
+            result, chash = extract_article(html, link, label, snippet, matcher, known_hash(link), timings)
+            return finish(job, (result, chash, timings))
+
+        yield from fetcher.map(run_inline, jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context(),
+                             initializer=_init_worker, initargs=tuple(keywords)) as procs, \
+            ThreadPoolExecutor(max_workers=min(fetcher.max_workers, len(jobs))) as threads:
+
+        def fetch_and_submit(job):
+            link, label, snippet = job
+            try:
+                html = fetch_html(fetcher, link)
+                fut = procs.submit(_extract_in_worker, html, link, label, snippet, known_hash(link))
+            except Exception as e:
+                done.put((job, None, e))
+                return
+            fut.add_done_callback(lambda f: done.put((job, f, None)))
+
+        for job in jobs:
+            threads.submit(fetch_and_submit, job)
+        for _ in range(len(jobs)):
+            job, fut, err = done.get()
+            if err is not None:
+                yield job, None, err
+                continue
+            try:
+                yield job, finish(job, fut.result()), None
+            except Exception as e:
+                yield job, None, e
@@ -0,0 +1,547 @@
+# scraper.py - núcleo del Scraper Electromedicina V15 (sin Streamlit)
+# Lo usan la app (app.py) y la línea de comandos (cli.py).
+import re
+from urllib.parse import quote_plus, urlparse, parse_qs
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from dedupe import SimhashIndex, simhash, collapse_duplicates
+from extraction import (
+    INTERNAL_COLUMNS, get_matcher, extract_article, confidence_scores, fecha_sort_key, is_quality,
+)
+from fetcher import BlockedError, shared_fetcher
+from http_cache import normalize_url
+from metrics import MeteredFetcher, RunMetrics
+from frontier import discover_links, rank_entries, source_entries
+from parsing import BS_FEATURES
+from pipeline import fetch_html, process_jobs, remember
+from screening import SKIP, SNIPPET, is_irrelevant, is_walled, screen
+from sources import as_source
+
+# ------------- LISTAS Y DICT -------------
+# términos ampliados y de contexto
+equipos_keywords = [
+    "resonador", "resonancia magnética", "resonancia", "rmn",
+    "tomógrafo", "tomografía", "tomografo", "tc", "scanner", "escáner",
+    "rayos x", "radiografía", "radiografia", "radiología", "radiologia",
+    "angiografo", "angiografía", "angiografia", "hemodinamia",
+    "ecógrafo", "ecografía", "ecografo", "ecografia", "ultrasonido",
+    "mamógrafo", "mamografía", "mamografo", "pet", "spect",
+    "instaló", "instalaron", "adquirió", "adquirieron", "donó", "donaron",
+    "incorporó", "incorporaron", "estrenó", "sumó", "entregó", "renovó",
+    "nueva sala", "nuevo equipo", "modernización", "modernizacion"
+]
+
+marcas_keywords = [
+    "Philips", "Siemens", "GE", "Canon", "Mindray", "Hitachi", "Fujifilm", "Agfa",
+    "Medtronic", "Dräger", "Drager", "Samsung", "Neusoft", "Esaote", "Carestream",
+    "Toshiba", "Hologic", "Varian", "Shimadzu"
+]
+
+# los indicadores de hospital (hospital_indicators) viven en extraction.py, compilados en un único regex
+
+modalidad_dict = {
+    "CT": ["tomógrafo", "tomografia", "tomografía", "tc", "escáner", "scanner"],
+    "DXR": ["rayos x", "radiografía", "radiografia", "radiología", "radiologia"],
+    "MR": ["resonador", "resonancia", "rmn", "resonancia magnética"],
+    "IGT": ["angiografo", "angiografía", "angiografia", "hemodinamia", "intervencionista"],
+    "US": ["ecógrafo", "ecografia", "ecografía", "ultrasonido", "doppler"],
+    "MG": ["mamógrafo", "mamografia", "mamografía"]
+}
+
+# ------------- FUENTES INSTITUCIONALES / DISTRIBUIDORES -------------
+# Agregá o reemplazá URLs locales que conozcas para más eficacia.
+# Cada valor es la URL del listado de noticias o un dict que además declara de dónde leer
+# las notas ya estructuradas (título, fecha y cuerpo, muchas por pedido; ver sources.py):
+#   "Distribuidor": {"url": "https://.../noticias", "feed": "https://.../feed/"}
+#   "Distribuidor WP": {"url": "https://.../noticias", "api": "wordpress"}
+#   "Distribuidor API": {"url": "...", "api": "https://.../api/news", "fields": {"items": "data", "link": "url", ...}}
+# El listado HTML (enlaces, feeds que declare, sitemap, paginación) queda como respaldo.
+institutional_sites = {
+    "Philips AR - News": "https://www.philips.com.ar/a-w/about/news.html",
+    "Siemens Healthineers AR (global / noticias)": "https://www.siemens-healthineers.com/es-ar",
+    "Mindray - News": "https://www.mindray.com/en/news.html",
+    # ejemplos locales de distribuidores que suelen publicar instalaciones:
+    # "Distribuidor Ejemplo": "https://www.distribuidorejemplo.com.ar/noticias"
+}
+
+comprar_search = "https://www.argentina.gob.ar/compras?search="  # heurística
+comprar_query = "equipamiento OR tomógrafo OR resonador"
+# COMPR.AR como fuente: admite "feed" / "api" igual que institutional_sites
+comprar_source = {"url": comprar_search + quote_plus(comprar_query)}
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+
+
+# verbos de acción que anuncian una instalación (también están en equipos_keywords)
+acciones_keywords = ["instaló", "instalaron", "adquirió", "adquirieron", "donó", "donaron",
+                     "incorporó", "incorporaron", "estrenó", "sumó", "entregó", "renovó"]
+# contexto institucional de las consultas por modalidad / marca
+contexto_keywords = ["hospital", "clínica", "sanatorio"]
+
+
+def default_keywords():
+    return equipos_keywords, marcas_keywords, modalidad_dict
+
+
+def merge_keywords(custom_keywords):
+    """equipos_keywords más las keywords custom (texto separado por comas), sin modificar la lista base."""
+    merged = list(equipos_keywords)
+    for w in [x.strip() for x in (custom_keywords or "").split(",") if x.strip()]:
+        if w.lower() not in [k.lower() for k in merged]:
+            merged.append(w)
+    return merged
+
+
+# ------------- PROCESS ARTICLE (usa snippet si el body falla) -------------
+def process_article_from_link(link, source_label, headers, snippet_text=None, fetcher=None, store=None, keywords=None):
+    """
+    visita link y extrae información; si el HTML no permite leer contenido (ej LinkedIn),
+    usa 'snippet_text' como texto base para extracción.
+    Si se pasa 'fetcher', la descarga respeta sus límites por host.
+    Con 'store' (modo incremental) devuelve None si el contenido no cambió desde la última visita.
+    'keywords' es (equipos, marcas, modalidad_dict); por defecto las listas de este módulo.
+    """
+    # LinkedIn y similares devuelven un muro de login: alcanza con el snippet
+    html = None if snippet_text and is_walled(link) else fetch_html(fetcher or shared_fetcher(headers), link)
+    known_hash = store.get_hash(link) if store is not None else None
+    result, chash = extract_article(html, link, source_label, snippet_text, get_matcher(*(keywords or default_keywords())), known_hash)
+    if store is not None:
+        remember(store, link, source_label, result, chash)
+    return result
+
+# ------------- LINKEDIN: buscar en Google y extraer snippet -------------
+def linkedin_query(query_terms, context_terms=None):
+    """Consulta site:linkedin.com/posts con query_terms en OR (y, si hay, context_terms como segundo grupo)."""
+    q = f"site:linkedin.com/posts +(Argentina) +({' OR '.join(query_terms)})"
+    if context_terms:
+        q += f" +({' OR '.join(context_terms)})"
+    return q
+
+
+def linkedin_search_with_snippets(query_terms, pages_to_check=2, headers=None, fetcher=None, stats=None,
+                                  context_terms=None, seen=None):
+    """
+    Busca en Google resultados site:linkedin.com/posts con query_terms (list of strings).
+    Retorna lista de tuples (url, snippet_text).
+    Deja de paginar si Google bloquea (429 / captcha: el fetcher abre el circuito del host)
+    o si una página no trae resultados nuevos. Si se pasa el dict 'stats', anota
+    'google_blocked' (True/False), 'google_errors' y 'google_pages'. 'seen' es un set
+    compartido entre consultas: lo que ya trajo otra consulta no cuenta como nuevo.
+    """
+    stats = {} if stats is None else stats
+    stats.setdefault("google_blocked", False)
+    stats.setdefault("google_errors", 0)
+    stats.setdefault("google_pages", 0)
+    seen = set() if seen is None else seen
+    headers = headers or {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+    # la pausa entre páginas la aplica el limitador por host del fetcher
+    fetcher = fetcher or shared_fetcher(headers, host_delay=0.3)
+    base = "https://www.google.com/search?q="
+    q_enc = quote_plus(linkedin_query(query_terms, context_terms))
+    results = []
+
+    for p in range(pages_to_check):
+        start = p * 10
+        url = f"{base}{q_enc}&hl=es&start={start}"
+        found_before = len(results)
+        try:
+            resp = fetcher.get(url, kind="google")
+            stats["google_pages"] += 1
+            soup = BeautifulSoup(resp.text, BS_FEATURES)
+            # Google muestra resultados en bloques; intentar varias heurísticas para el snippet
+            # 1) bloques con class 'BNeawe s3v9rd AP7Wnd' suelen contener snippet (varía)
+            snippet_blocks = soup.find_all("div", class_=re.compile(r'BNeawe.*'))
+            # también buscar bloques 'div.IsZvec' o 'div.VwiC3b'
+            snippets = {}
+            for block in soup.find_all("div"):
+                # buscar enlace dentro del bloque
+                a = block.find("a", href=True)
+                if a and "linkedin.com" in a.get("href"):
+                    href = a.get("href")
+                    # Google wraps redirect in '/url?q=...'
+                    m = re.search(r'/url\?q=(https?://[^&]+)&', href)
+                    link = m.group(1) if m else href
+                    # snippet text: buscar siguiente <div> con texto corto o el propio block text
+                    text = block.get_text(" ", strip=True)
+                    # Sanitize: evitar largos excesivos
+                    snippet = text if text and len(text) < 800 else (block.get_text(" ", strip=True)[:800] if text else "")
+                    if link not in [r[0] for r in results]:
+                        results.append((link, snippet))
+            # fallback: parse 'a' tags and try to get adjacent span/div snippet
+            if not results:
+                for a in soup.find_all("a", href=True):
+                    href = a.get("href")
+                    if not href:
+                        continue
+                    m = re.search(r'/url\?q=(https?://[^&]+)&', href)
+                    actual = m.group(1) if m else href
+                    if "linkedin.com" in actual:
+                        # try to find snippet in parent or sibling
+                        parent = a.parent
+                        snippet = ""
+                        # look for sibling div or span with short text
+                        for sib in parent.find_all_next(['div', 'span'], limit=4):
+                            txt = sib.get_text(" ", strip=True)
+                            if txt and len(txt) < 900:
+                                snippet = txt
+                                break
+                        results.append((actual, snippet))
+        except BlockedError:
+            # circuito abierto: las páginas siguientes también vendrían bloqueadas
+            stats["google_blocked"] = True
+            break
+        except Exception:
+            # ignorar página si falla
+            stats["google_errors"] += 1
+            continue
+        new_links = [u for u, _ in results[found_before:] if u not in seen]
+        if not new_links:
+            break  # sin resultados nuevos: no hay más páginas útiles
+        seen.update(new_links)
+    # dedupe preserving order
+    dedup = []
+    seen = set()
+    for u, s in results:
+        if u not in seen:
+            dedup.append((u, s))
+            seen.add(u)
+    return dedup
+
+# ------------- LINKEDIN: consultas en shards -------------
+# términos por consulta: Google ignora lo que pase de ~32 palabras
+MAX_TERMS_PER_QUERY = 8
+# tope de páginas de Google por corrida, sumando todas las consultas (Google bloquea rápido)
+GOOGLE_PAGE_BUDGET = 40
+
+
+def _chunks(terms, size):
+    return [terms[i:i + size] for i in range(0, len(terms), size)]
+
+
+def plan_query_shards(custom_terms=(), modalidades=None, marcas=None, acciones=None, equipos=None,
+                      max_terms=MAX_TERMS_PER_QUERY):
+    """
+    Reparte la búsqueda de LinkedIn en consultas chicas en vez de un único OR gigante:
+    una por modalidad (sus términos + contexto hospital/clínica/sanatorio), una por marca
+    (+ un equipo por modalidad, para no traer cualquier post de Siemens o Philips), los
+    verbos de acción de a grupos (+ un equipo por modalidad), los términos de 'equipos'
+    que no cubre ninguna modalidad (pet, spect, nueva sala...) y las keywords custom de a
+    grupos. Devuelve [(nombre, términos, contexto)].
+    """
+    modalidades = modalidad_dict if modalidades is None else modalidades
+    marcas = marcas_keywords if marcas is None else marcas
+    acciones = acciones_keywords if acciones is None else acciones
+    equipos = equipos_keywords if equipos is None else equipos
+    shards = []
+    for mod, terms in modalidades.items():
+        for i, chunk in enumerate(_chunks(list(dict.fromkeys(terms)), max_terms)):
+            shards.append((f"modalidad {mod}" + (f" ({i + 1})" if i else ""), chunk, contexto_keywords))
+    por_modalidad = [terms[0] for terms in modalidades.values() if terms]
+    for marca in marcas:
+        shards.append((f"marca {marca}", [marca], por_modalidad or contexto_keywords))
+    for i, chunk in enumerate(_chunks(list(acciones), max_terms // 2 or 1)):
+        shards.append((f"acciones {i + 1}", chunk, por_modalidad))
+    covered = {t.lower() for terms in modalidades.values() for t in terms} | {a.lower() for a in acciones}
+    sueltos = list(dict.fromkeys(t for t in equipos if t.lower() not in covered))
+    for i, chunk in enumerate(_chunks(sueltos, max_terms)):
+        shards.append((f"equipos {i + 1}", chunk, contexto_keywords))
+    for i, chunk in enumerate(_chunks(list(custom_terms), max_terms)):
+        shards.append((f"custom {i + 1}", chunk, contexto_keywords))
+    return shards
+
+
+def shard_pages(n_shards, pages_per_shard=1, budget=GOOGLE_PAGE_BUDGET):
+    """
+    Reparte el tope total de páginas de Google entre las consultas: primero una página
+    a cada una en orden (las del final se quedan sin nada si no alcanza) y, si sobra,
+    otra vuelta desde las primeras hasta 'pages_per_shard'. budget=None: sin tope.
+    """
+    pages = [0] * n_shards
+    left = n_shards * pages_per_shard if budget is None else budget
+    for _ in range(pages_per_shard):
+        for i in range(n_shards):
+            if left <= 0:
+                return pages
+            pages[i] += 1
+            left -= 1
+    return pages
+
+
+def linkedin_search_sharded(shards, pages_per_shard=1, headers=None, fetcher=None, stats=None,
+                            page_budget=GOOGLE_PAGE_BUDGET):
+    """
+    Corre las consultas de plan_query_shards en paralelo (el fetcher limita los pedidos
+    a Google y corta todo si bloquea), cada una con hasta 'pages_per_shard' páginas y
+    sin pasar entre todas de 'page_budget' (ver shard_pages), y junta los resultados sin
+    repetir URLs entre consultas. Devuelve [(url, snippet)] en el orden de los shards; en
+    'stats' suma además 'shards' y 'shard_results' por shard.
+    """
+    stats = {} if stats is None else stats
+    fetcher = fetcher or shared_fetcher(headers, host_delay=0.3)
+    seen = set()
+    per_shard = {}
+    planned = [(shard, pages) for shard, pages in zip(shards, shard_pages(len(shards), pages_per_shard, page_budget))
+               if pages]
+
+    def search(job):
+        # los contadores de cada consulta se suman después: no se comparten entre threads
+        (_, terms, context), pages = job
+        shard_stats = {}
+        found = linkedin_search_with_snippets(terms, pages_to_check=pages, headers=headers, fetcher=fetcher,
+                                              stats=shard_stats, context_terms=context, seen=seen)
+        return found, shard_stats
+
+    for ((name, _, _), _), out, err in fetcher.map(search, planned):
+        per_shard[name] = ([], {}) if err else out
+    results = []
+    merged = set()
+    stats.update({"google_blocked": False, "google_errors": 0, "google_pages": 0, "shards": len(shards), "shard_results": {}})
+    for name, _, _ in shards:
+        found, st = per_shard.get(name, ([], {}))
+        stats["google_blocked"] |= st.get("google_blocked", False)
+        stats["google_errors"] += st.get("google_errors", 0)
+        stats["google_pages"] += st.get("google_pages", 0)
+        new = 0
+        for url, snippet in found:
+            key = normalize_url(url)
+            if key not in merged:
+                merged.add(key)
+                results.append((url, snippet))
+                new += 1
+        stats["shard_results"][name] = new
+    return results
+
+# ------------- RUN -------------
+# snippets más cortos no dan una huella confiable
+SNIPPET_MIN_CHARS = 80
+
+def run_scrape(pages_ln=1, include_institutional=True, include_comprar=False, max_links_per_site=60,
+               custom_keywords="", sites=None, headers=None, http_cache=None, store=None, recheck_days=7,
+               extraction_workers=None, on_status=None, on_progress=None, on_row=None, sink=None, metrics=None,
+               fetcher=None, google_pages=GOOGLE_PAGE_BUDGET):
+    """
+    Corre la búsqueda completa: LinkedIn vía snippets de Google ('pages_ln' páginas por
+    consulta y a lo sumo 'google_pages' en total, ver shard_pages), listados institucionales
+    (por defecto 'institutional_sites'; valores URL o dict de fuente, ver sources.py) y,
+    opcionalmente, COMPR.AR. Las notas de feeds / APIs que ya traen lo necesario no se descargan.
+    on_status(texto) y on_progress(procesados, total) permiten mostrar el avance y
+    on_row(fila) recibe cada fila en cuanto se extrae. Con 'sink' (ver sinks.py) las filas
+    se escriben a disco a medida que aparecen y no se acumulan en memoria; el
+    DataFrame final se arma al terminar leyendo el sink.
+    Cada etapa se mide en 'metrics' (un RunMetrics nuevo si no se pasa); stats["report"]
+    trae el reporte de la corrida (ver metrics.py). 'fetcher' reemplaza al Fetcher compartido
+    (ej. el de benchmarks/fixture_server.py, que apunta a un servidor local).
+    Devuelve (DataFrame de resultados, stats).
+    """
+    on_status = on_status or (lambda texto: None)
+    on_progress = on_progress or (lambda done, total: None)
+    on_row = on_row or (lambda row: None)
+    headers = headers or DEFAULT_HEADERS
+    sites = institutional_sites if sites is None else sites
+    keywords = (merge_keywords(custom_keywords), marcas_keywords, modalidad_dict)
+    # concurrencia acotada: varios hosts en paralelo, cortesía por dominio;
+    # la sesión (keep-alive + reintentos) se comparte entre corridas
+    fetcher = fetcher or shared_fetcher(headers, max_workers=16, max_per_host=2, host_delay=0.25,
+                                        host_overrides=(("www.google.com", 0.3),), cache=http_cache)
+    metrics = metrics or RunMetrics()
+    fetcher = MeteredFetcher(fetcher, metrics)
+    trips_before = fetcher.breaker.trips()
+    max_age = recheck_days * 86400 if recheck_days else None
+    already_seen = (lambda u: not store.needs_visit(u, max_age)) if store else None
+
+    collected = []
+    seen_links = set()
+
+    # consultas de LinkedIn: una por modalidad, marca y grupo de verbos, más las keywords custom
+    custom_terms = [w for w in keywords[0] if w not in equipos_keywords]
+    shards = plan_query_shards(custom_terms, modalidades=keywords[2], marcas=keywords[1])
+
+    errors = 0
+    duplicates = 0
+    # trabajos a procesar: (link, fuente, snippet)
+    jobs = []
+    # snippets casi iguales (reposts / el mismo post en varias URLs) no se descargan de nuevo
+    snippet_index = SimhashIndex()
+
+    # 1) LinkedIn (pasivo) via Google Search snippets
+    on_status(f"Buscando posts públicos de LinkedIn vía Google Search (snippets, {len(shards)} consultas)...")
+    search_stats = {}
+    with metrics.timed("google_search"):
+        ln_results = linkedin_search_sharded(shards, pages_per_shard=pages_ln, headers=headers, fetcher=fetcher,
+                                             stats=search_stats, page_budget=google_pages) if pages_ln else []
+    search_stats.setdefault("google_blocked", False)
+    search_stats.setdefault("google_errors", 0)
+    if search_stats["google_blocked"]:
+        on_status("Google bloqueó la búsqueda (429 / captcha): se corta la paginación y se sigue con lo obtenido.")
+    for link, snippet in ln_results:
+        # normalizar redirecciones / quitar parámetros google
+        parsed = urlparse(link)
+        if parsed.netloc.endswith("google.com") and "q" in parse_qs(parsed.query):
+            # try to extract from q param
+            try:
+                qv = parse_qs(parsed.query).get("q")[0]
+                link = qv
+            except:
+                pass
+        if link in seen_links:
+            continue
+        seen_links.add(link)
+        if already_seen and already_seen(link):
+            continue
+        if snippet and len(snippet) >= SNIPPET_MIN_CHARS and snippet_index.seen(simhash(snippet), link):
+            duplicates += 1
+            continue
+        jobs.append((link, "LinkedIn", snippet))
+
+    # 2) institucionales / distribuidores + 3) COMPR.AR (opcional heurístico)
+    listings = []
+    if include_institutional:
+        listings += [as_source(label, spec) for label, spec in sites.items()]
+    if include_comprar:
+        listings.append(as_source("COMPR.AR", comprar_source))
+    # los enlaces obviamente irrelevantes (legales, redes, login...) no gastan el cupo por sitio
+    skip_link = (lambda u: is_irrelevant(u) or already_seen(u)) if already_seen else is_irrelevant
+    anchors = {}
+    # link -> Entry de los enlaces que vinieron de un feed / API (título, fecha y cuerpo ya estructurados)
+    entries = {}
+    matcher = get_matcher(*keywords)
+    if listings:
+        on_status(f"Descubriendo enlaces en {len(listings)} listados institucionales / COMPR.AR (feeds, APIs, sitemap, paginación)...")
+
+        def discover(source):
+            with metrics.timed("listing_discovery"):
+                declared = source_entries(fetcher, source)
+                if declared:
+                    # el feed / API declarado reemplaza al listado HTML
+                    return rank_entries(declared, matcher), {e.link: e for e in declared}
+                found = {}
+                resp = fetcher.get(source.url, kind="listing")
+                # COMPR.AR es una búsqueda: su sitemap / feeds no son de noticias
+                candidates = discover_links(fetcher, source.url, resp.text, matcher, max_links_per_site,
+                                            use_sitemap=source.label != "COMPR.AR", entries=found)
+                return candidates, found
+
+        ranked = {}
+        for source, result, err in fetcher.map(discover, listings):
+            if err:
+                errors += 1
+            else:
+                ranked[source.label] = result
+        # respetar el orden configurado al repartir enlaces; dentro de cada sitio, los más relevantes primero
+        for source in listings:
+            candidates, found = ranked.get(source.label, ((), {}))
+            taken = 0
+            for link, txt, _ in candidates:
+                if taken >= max_links_per_site:
+                    break
+                if link in seen_links:
+                    continue
+                seen_links.add(link)
+                if skip_link(link):
+                    continue
+                anchors[link] = txt
+                if link in found:
+                    entries[link] = found[link]
+                jobs.append((link, source.label, None))
+                taken += 1
+
+    processed = 0
+    found = 0
+
+    def emit(art):
+        nonlocal found
+        if is_quality(art):
+            found += 1
+            metrics.row(art["Fuente"])
+            if sink is not None:
+                sink.write(art)
+            else:
+                collected.append(art)
+            on_row(art)
+
+    # pre-filtro: extraer primero del snippet / texto del enlace y descargar sólo lo que puede sumar
+    to_fetch = []
+    skipped = 0
+    from_snippet = 0
+    from_feed = 0
+    for job in jobs:
+        link, label, _ = job
+        with metrics.timed("screening"):
+            action, art, chash = screen(job, matcher, anchor_text=anchors.get(link),
+                                        known_hash=store.get_hash(link) if store else None, entry=entries.get(link))
+        if action == SKIP:
+            skipped += 1
+        elif action == SNIPPET:
+            if link in entries:
+                from_feed += 1
+            else:
+                from_snippet += 1
+            if store:
+                remember(store, link, label, art, chash)
+            emit(art)
+        else:
+            to_fetch.append(job)
+            continue
+        processed += 1
+    on_progress(processed, len(jobs))
+
+    # procesar en paralelo los artículos que hay que descargar
+    on_status(f"Procesando {len(to_fetch)} enlaces en paralelo ({extraction_workers if extraction_workers is not None else 'auto'} procesos de extracción; "
+              f"{from_snippet} resueltos con el snippet, {from_feed} con feeds / APIs, {skipped} descartados)...")
+    # descarga en threads, parseo + extracción en procesos
+    for job, art, err in process_jobs(to_fetch, fetcher, keywords, store=store, workers=extraction_workers, metrics=metrics):
+        processed += 1
+        on_progress(processed, len(jobs))
+        if err:
+            errors += 1
+        else:
+            emit(art)
+
+    on_status("Finalizado. Preparando resultados...")
+    stats = {"processed": len(jobs), "new": found, "errors": errors, "duplicates": duplicates,
+             "fetched": len(to_fetch), "from_snippet": from_snippet, "from_feed": from_feed, "skipped": skipped,
+             "google_blocked": search_stats["google_blocked"], "google_errors": search_stats["google_errors"],
+             "google_pages": search_stats.get("google_pages", 0), "shards": len(shards),
+             # hosts que bloquearon en esta corrida: veces que se abrió su circuito
+             "blocked": {h: n - trips_before.get(h, 0) for h, n in fetcher.breaker.trips().items() if n > trips_before.get(h, 0)}}
+    if store:
+        # el histórico ya incluye lo nuevo de esta corrida
+        collected = store.history()
+    elif sink is not None:
+        collected = sink.read_all()
+    with metrics.timed("dataframe"):
+        df = build_results_df(collected)
+    stats["report"] = metrics.report(dict(stats, rows=len(df)))
+    return df, stats
+
+
+def build_results_df(collected):
+    """
+    DataFrame final: sin links repetidos, un registro por evento (artículos casi iguales o
+    mismo hospital + modalidad + marca, con todas sus fuentes) y ordenado por Confianza y
+    fecha no-cursiva.
+    """
+    if not collected:
+        return pd.DataFrame()
+    df = pd.DataFrame(collected).drop_duplicates(subset=["Link"]).reset_index(drop=True)
+    df["Confianza"] = confidence_scores(df)
+    df = collapse_duplicates(df).drop(columns=INTERNAL_COLUMNS, errors="ignore")
+    return sort_results(df)
+
+
+def sort_results(df):
+    """Ordena por Confianza y fecha no-cursiva (fechas parseadas por columna, no fila por fila)."""
+    df = df.assign(Fecha_dt=fecha_sort_key(df["Fecha instalación"]))
+    return df.sort_values(by=["Confianza", "Fecha_dt"], ascending=[False, False]).drop(columns=["Fecha_dt"])
+
+
+def write_results(df, path):
+    """Guarda los resultados según la extensión: .csv, .parquet o .jsonl."""
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)  # requiere pyarrow o fastparquet
+    elif path.endswith(".jsonl"):
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8")
@@ -0,0 +1,108 @@
+# screening.py - pre-filtro de enlaces: decidir con el snippet / texto del enlace si vale la pena descargar
+import re
+from urllib.parse import urlparse
+
+from extraction import extract_article, is_quality
+from sources import entry_page
+
+# dominios que devuelven un muro de login: la descarga no aporta nada sobre el snippet de Google
+WALLED_DOMAINS = ("linkedin.com",)
+
+# redes sociales y similares: nunca son la nota de una instalación
+IRRELEVANT_DOMAINS = (
+    "facebook.com", "twitter.com", "x.com", "instagram.com", "youtube.com", "youtu.be",
+    "whatsapp.com", "wa.me", "tiktok.com", "pinterest.com", "flickr.com",
+)
+
+# navegación, legales, cuentas, etc.
+_IRRELEVANT_PATH_RE = re.compile(
+    r"/(privacy|privacidad|privacy-policy|cookies?|legal|legales|terms|terminos|términos|condiciones|"
+    r"imprint|impressum|login|signin|sign-in|register|registro|account|cuenta|cart|carrito|"
+    r"careers?|jobs?|empleos?|trabaja-con-nosotros|contact|contacto|contact-us|search|buscar|"
+    r"sitemap|accessibility|accesibilidad)(?:[/.?#]|$)",
+    re.IGNORECASE,
+)
+
+_ASSET_EXTENSIONS = (
+    ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico", ".css", ".js",
+    ".zip", ".rar", ".mp4", ".mp3", ".avi", ".mov", ".woff", ".woff2", ".ttf",
+)
+
+# textos de enlace de menú / pie que no llevan a notas ("leer más" / "ver más" no: en los
+# listados suelen ser el enlace a la nota misma)
+_NAV_ANCHORS = {
+    "inicio", "home", "contacto", "contact", "contact us", "privacidad", "privacy", "cookies",
+    "legales", "legal", "términos y condiciones", "terminos y condiciones", "terms of use",
+    "ingresar", "login", "log in", "registrarse", "sign in", "buscar", "search", "menú", "menu",
+    "trabajá con nosotros", "careers", "empleos", "mapa del sitio", "sitemap",
+}
+
+# cuerpo de un ítem de feed / API a partir del cual se lo toma como la nota completa
+# (content:encoded, articleBody de una API) y no un resumen: la página no agregaría nada
+FULL_TEXT_CHARS = 600
+
+# acciones de screen()
+SKIP = "skip"        # enlace irrelevante: no se descarga ni se extrae
+SNIPPET = "snippet"  # la fila sale del snippet: no hace falta descargar
+FETCH = "fetch"      # hay que descargar la página
+
+
+def _host(link):
+    return (urlparse(link).hostname or "").lower()
+
+
+def _on_domain(host, domains):
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def is_walled(link):
+    return _on_domain(_host(link), WALLED_DOMAINS)
+
+
+def is_irrelevant(link, anchor_text=None):
+    """True para enlaces que obviamente no son notas: redes sociales, legales, login, archivos estáticos, menú."""
+    parsed = urlparse(link)
+    if parsed.scheme not in ("http", "https"):
+        return True
+    if _on_domain((parsed.hostname or "").lower(), IRRELEVANT_DOMAINS):
+        return True
+    path = parsed.path.lower()
+    if path.endswith(_ASSET_EXTENSIONS) or _IRRELEVANT_PATH_RE.search(path):
+        return True
+    return bool(anchor_text) and anchor_text.strip().lower() in _NAV_ANCHORS
+
+
+def is_complete(row):
+    """La fila ya tiene todo lo que podría aportar la página: hospital, tipo, marca, modelo y fecha real."""
+    fecha = row.get("Fecha instalación") or ""
+    return (is_quality(row) and bool(row.get("Marca")) and bool(row.get("Modelo"))
+            and bool(fecha) and not (fecha.startswith("*") and fecha.endswith("*")))
+
+
+def screen(job, matcher, anchor_text=None, known_hash=None, entry=None):
+    """
+    Decide qué hacer con un job (link, fuente, snippet) antes de descargarlo.
+    Corre la extracción sobre el snippet de Google (o el texto del enlace del listado)
+    y devuelve (acción, fila, hash): SKIP si el enlace es irrelevante, SNIPPET si la
+    fila del snippet alcanza (dominio con muro de login o fila completa) y FETCH si
+    la página puede agregar datos. La fila es None salvo con SNIPPET ('known_hash'
+    funciona igual que en extract_article).
+    Con 'entry' (ítem de feed / API, ver sources.py) se extrae de su título, fecha y
+    cuerpo: alcanza si la fila queda completa o si el cuerpo es la nota entera.
+    """
+    link, label, snippet = job
+    if is_irrelevant(link, anchor_text):
+        return SKIP, None, None
+    if entry is not None:
+        row, chash = extract_article(None, link, label, None, matcher, page=entry_page(entry))
+        if is_complete(row) or len(entry.body) >= FULL_TEXT_CHARS:
+            return SNIPPET, (None if chash == known_hash else row), chash
+    if is_walled(link):
+        row, chash = extract_article(None, link, label, snippet, matcher, known_hash)
+        return SNIPPET, row, chash
+    text = snippet or anchor_text
+    if text:
+        row, chash = extract_article(None, link, label, text, matcher)
+        if is_complete(row):
+            return SNIPPET, (None if chash == known_hash else row), chash
+    return FETCH, None, None
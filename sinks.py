@@ -0,0 +1,70 @@
+# sinks.py - salida incremental de filas (append-only) mientras avanza la corrida
+import csv
+import json
+import os
+
+from extraction import INTERNAL_COLUMNS, RESULT_COLUMNS
+
+
+class JsonlSink:
+    """Una fila JSON por línea; cada write() queda en disco (flush) por si la corrida se corta."""
+
+    def __init__(self, path, append=True):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._f = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, row):
+        self._f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def read_all(self):
+        self._f.flush()
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(JsonlSink):
+    """
+    Igual que JsonlSink pero en CSV: columnas de RESULT_COLUMNS más las internas (la Huella,
+    para que read_all() agrupe duplicados igual que con JSONL); encabezado sólo si el
+    archivo es nuevo, y si ya existe se respetan sus columnas.
+    """
+
+    def __init__(self, path, append=True):
+        new = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        fieldnames = RESULT_COLUMNS + INTERNAL_COLUMNS
+        if not new:
+            with open(path, encoding="utf-8", newline="") as f:
+                fieldnames = next(csv.reader(f), None) or fieldnames
+        super().__init__(path, append)
+        self._writer = csv.DictWriter(self._f, fieldnames=fieldnames, extrasaction="ignore")
+        if new:
+            self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+        self._f.flush()
+
+    def read_all(self):
+        self._f.flush()
+        with open(self.path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        for r in rows:
+            r["Confianza"] = int(r.get("Confianza") or 0)
+        return rows
+
+
+def open_sink(path, append=True):
+    """Sink según la extensión: .csv o JSONL (cualquier otra)."""
+    return CsvSink(path, append) if path.endswith(".csv") else JsonlSink(path, append)
@@ -0,0 +1,118 @@
+# sources.py - adaptadores de fuentes institucionales: feeds RSS/Atom y APIs JSON que traen
+# título, fecha y cuerpo de muchas notas por pedido, sin pasar por las heurísticas del HTML
+import re
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from parsing import BS_FEATURES, ParsedPage, html_to_text
+
+# una fuente: listado HTML (respaldo) más, opcionalmente, un feed y / o una API JSON declarados.
+# 'fields' mapea los campos de la API: items (ruta a la lista), link, title, date, body
+Source = namedtuple("Source", ["label", "url", "feed", "api", "fields"])
+
+# un ítem de feed / API: la nota ya estructurada (fecha ISO aaaa-mm-dd o None)
+Entry = namedtuple("Entry", ["link", "title", "date", "body"])
+
+# APIs conocidas: se declaran con {"api": "wordpress"} y sólo hace falta la URL del listado
+API_PRESETS = {
+    # WordPress REST: /wp-json/wp/v2/posts devuelve una lista de posts con el contenido completo
+    "wordpress": ("/wp-json/wp/v2/posts?per_page=50&_fields=link,title,date,excerpt,content",
+                  {"items": "", "link": "link", "title": "title.rendered", "date": "date",
+                   "body": "content.rendered"}),
+}
+_DEFAULT_FIELDS = {"items": "items", "link": "url", "title": "title", "date": "date", "body": "body"}
+_ISO_PREFIX_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def as_source(label, spec):
+    """
+    Normaliza una entrada de 'institutional_sites': una URL (sólo el listado HTML, como
+    siempre) o un dict {"url", "feed", "api", "fields"}. "api" puede ser una URL o el
+    nombre de un preset de API_PRESETS (ej. "wordpress", relativo al host del listado).
+    """
+    if isinstance(spec, str):
+        return Source(label, spec, None, None, None)
+    url = spec.get("url")
+    api = spec.get("api")
+    fields = dict(_DEFAULT_FIELDS, **(spec.get("fields") or {}))
+    if api in API_PRESETS:
+        path, preset_fields = API_PRESETS[api]
+        api = urljoin(url or spec.get("feed") or "", path)
+        fields = dict(preset_fields, **(spec.get("fields") or {}))
+    return Source(label, url, spec.get("feed"), api, fields if api else None)
+
+
+def entry_date(value):
+    """Fecha de un ítem (RFC 822 de RSS o ISO 8601 de Atom / APIs) como aaaa-mm-dd, o None."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    m = _ISO_PREFIX_RE.match(value)
+    if m:
+        return m.group(0)
+    try:
+        return parsedate_to_datetime(value).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+
+def _text_of(item, *names):
+    for name in names:
+        node = item.find(name)
+        if node is not None and node.get_text(strip=True):
+            return node.get_text(strip=True)
+    return ""
+
+
+def feed_entries(xml, base_url=""):
+    """Ítems de un feed RSS o Atom como Entry (link absoluto, título, fecha, cuerpo en texto plano)."""
+    soup = BeautifulSoup(xml, "xml" if BS_FEATURES == "lxml" else "html.parser")
+    entries = []
+    for item in soup.find_all(["item", "entry"]):
+        link = item.find("link", rel="alternate") or item.find("link")
+        href = None
+        if link is not None:
+            href = link.get("href") or link.get_text(strip=True)
+        if not href:
+            guid = item.find("guid")
+            href = guid.get_text(strip=True) if guid is not None else None
+        if not href:
+            continue
+        # content:encoded / content traen la nota completa; description / summary, un resumen
+        body = _text_of(item, "encoded", "content", "description", "summary")
+        entries.append(Entry(urljoin(base_url, href), _text_of(item, "title"),
+                             entry_date(_text_of(item, "pubDate", "published", "updated", "date")),
+                             html_to_text(body)))
+    return entries
+
+
+def _pluck(obj, path):
+    # "title.rendered" -> obj["title"]["rendered"]; "" es el objeto mismo
+    for key in filter(None, (path or "").split(".")):
+        obj = obj.get(key) if isinstance(obj, dict) else None
+    return obj
+
+
+def api_entries(data, fields, base_url=""):
+    """Ítems de la respuesta JSON de una API de noticias según el mapeo 'fields' de la fuente."""
+    items = _pluck(data, fields.get("items"))
+    if not isinstance(items, list):
+        return []
+    entries = []
+    for item in items:
+        link = _pluck(item, fields.get("link"))
+        if not isinstance(link, str) or not link:
+            continue
+        title, date, body = (_pluck(item, fields.get(k)) for k in ("title", "date", "body"))
+        entries.append(Entry(urljoin(base_url, link), html_to_text(title) if isinstance(title, str) else "",
+                             entry_date(date) if isinstance(date, str) else None,
+                             html_to_text(body) if isinstance(body, str) else ""))
+    return entries
+
+
+def entry_page(entry):
+    """El ítem como ParsedPage, para extraer la fila sin descargar la nota (ver extract_article)."""
+    return ParsedPage(entry.title, entry.body, None, None, entry.date)
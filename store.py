@@ -0,0 +1,95 @@
+# store.py - registro persistente de enlaces visitados y filas extraídas (modo incremental)
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(".cache", "results.sqlite")
+
+
+def content_hash(texto):
+    return hashlib.sha1((texto or "").encode("utf-8", errors="ignore")).hexdigest()
+
+
+class ResultStore:
+    """
+    Guarda por URL el hash del contenido extraído, cuándo se vio y la fila
+    resultante, para que cada corrida procese sólo enlaces nuevos o cambiados
+    y sume lo nuevo al histórico.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS visits (
+                    url TEXT PRIMARY KEY,
+                    source TEXT,
+                    content_hash TEXT,
+                    first_seen REAL,
+                    last_seen REAL,
+                    row TEXT
+                )"""
+            )
+            conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def needs_visit(self, url, max_age=None):
+        """True si el enlace nunca se vio, o si se vio hace más de max_age segundos (None = no revisar)."""
+        row = self._conn().execute("SELECT last_seen FROM visits WHERE url = ?", (url,)).fetchone()
+        if not row:
+            return True
+        return max_age is not None and time.time() - row[0] > max_age
+
+    def get_hash(self, url):
+        """Hash del contenido de la última visita (None si nunca se vio)."""
+        row = self._conn().execute("SELECT content_hash FROM visits WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def touch(self, url):
+        """Renueva last_seen de un enlace cuyo contenido no cambió."""
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("UPDATE visits SET last_seen = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+
+    def record(self, url, source, chash, row=None):
+        """Registra la visita y la fila extraída (None si el artículo no calificó)."""
+        now = time.time()
+        data = json.dumps(row, ensure_ascii=False) if row else None
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute(
+                """INSERT INTO visits (url, source, content_hash, first_seen, last_seen, row)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       source = excluded.source, content_hash = excluded.content_hash,
+                       last_seen = excluded.last_seen, row = excluded.row""",
+                (url, source, chash, now, now, data),
+            )
+            conn.commit()
+
+    def history(self):
+        """Filas guardadas de todas las corridas, más recientes primero."""
+        rows = self._conn().execute("SELECT row FROM visits WHERE row IS NOT NULL ORDER BY last_seen DESC").fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def clear(self):
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("DELETE FROM visits")
+            conn.commit()